@@ -0,0 +1,197 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from airport.cache import bump_versions
+from airport.models import Flight, SeatHold, Ticket
+
+
+class SeatsTaken(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of requested seats are already taken."
+    default_code = "seats_taken"
+
+    def __init__(self, seats):
+        super().__init__()
+        self.seats = sorted(seats)
+        self.detail = {
+            "detail": self.detail,
+            "taken": [
+                {"flight": flight_id, "row": row, "seat": seat}
+                for flight_id, row, seat in self.seats
+            ],
+        }
+
+
+class SeatsUnavailable(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Not enough free seats on the flight."
+    default_code = "seats_unavailable"
+
+
+def lock_flights(flight_ids) -> dict:
+    """Serialize seat writers of flights until the transaction ends.
+
+    Flights are touched with a no-op UPDATE in id order: on PostgreSQL
+    it takes the rows locks, on SQLite (no SELECT ... FOR UPDATE) it
+    takes the database write lock, waiting for concurrent writers in
+    both cases. Seat maps are read only after that.
+    """
+    for flight_id in sorted(flight_ids):
+        Flight.objects.filter(pk=flight_id).update(
+            tickets_sold=F("tickets_sold")
+        )
+    return Flight.objects.select_related("airplane").in_bulk(flight_ids)
+
+
+def _release_expired_holds(flight, held_map) -> int:
+    """Drop expired holds of locked flight, releasing their seats"""
+    expired = list(flight.holds.filter(expires_at__lte=timezone.now()))
+    for hold in expired:
+        for row, seat in hold.seat_list:
+            held_map.release(row, seat)
+    SeatHold.objects.filter(id__in=[hold.id for hold in expired]).delete()
+    return len(expired)
+
+
+def _save_seat_maps(seat_maps=None, held_maps=None) -> None:
+    for flight_id in (seat_maps or {}).keys() | (held_maps or {}).keys():
+        fields = {}
+        if seat_maps and flight_id in seat_maps:
+            fields["seat_map"] = seat_maps[flight_id].to_bytes()
+            fields["tickets_sold"] = seat_maps[flight_id].count()
+        if held_maps and flight_id in held_maps:
+            fields["held_map"] = held_maps[flight_id].to_bytes()
+            fields["seats_held"] = held_maps[flight_id].count()
+        Flight.objects.filter(pk=flight_id).update(**fields)
+
+
+def book_tickets(order, tickets_data, hold=None) -> list[Ticket]:
+    """Create tickets of order, raise SeatsTaken on already taken seats.
+
+    Seats of given hold are converted into the tickets, seats of other
+    holds count as taken unless the hold has expired. Must run inside
+    a transaction.
+    """
+    flights = lock_flights({ticket["flight"].id for ticket in tickets_data})
+    seat_maps = {
+        flight_id: flight.seats for flight_id, flight in flights.items()
+    }
+    held_maps = {
+        flight_id: flight.held_seats for flight_id, flight in flights.items()
+    }
+    if hold is not None:
+        for row, seat in hold.seat_list:
+            held_maps[hold.flight_id].release(row, seat)
+        hold.delete()
+
+    seats = [
+        (ticket["flight"].id, ticket["row"], ticket["seat"])
+        for ticket in tickets_data
+    ]
+    for flight_id in {
+        flight_id for flight_id, row, seat in seats
+        if held_maps[flight_id].is_taken(row, seat)
+    }:
+        _release_expired_holds(flights[flight_id], held_maps[flight_id])
+    taken = [
+        (flight_id, row, seat)
+        for flight_id, row, seat in seats
+        if held_maps[flight_id].is_taken(row, seat)
+        or not seat_maps[flight_id].take(row, seat)
+    ]
+    if taken:
+        raise SeatsTaken(taken)
+
+    try:
+        with transaction.atomic():
+            tickets = Ticket.objects.bulk_create(
+                Ticket(order=order, **ticket_data)
+                for ticket_data in tickets_data
+            )
+    except IntegrityError:
+        # Seat maps out of sync with tickets: report the real owners
+        lookup = Q()
+        for ticket in tickets_data:
+            lookup |= Q(
+                flight=ticket["flight"], row=ticket["row"], seat=ticket["seat"]
+            )
+        raise SeatsTaken(
+            Ticket.objects.filter(lookup).values_list(
+                "flight_id", "row", "seat"
+            )
+        )
+
+    _save_seat_maps(seat_maps, held_maps)
+    bump_versions("ticket", "seathold")
+    return tickets
+
+
+def assign_seats(flight, count: int, adjacent: bool = False) -> list[dict]:
+    """Pick count free seats of flight, raise SeatsUnavailable if none.
+
+    Locks the flight until the transaction ends, so the seats stay free
+    for book_tickets in the same transaction. Expired holds are released
+    first to make their seats available.
+    """
+    flight = lock_flights({flight.id})[flight.id]
+    held_map = flight.held_seats
+    if flight.seats_held and _release_expired_holds(flight, held_map):
+        _save_seat_maps(held_maps={flight.id: held_map})
+    seats = (flight.seats | held_map).find_free(count, adjacent)
+    if seats is None:
+        raise SeatsUnavailable()
+    return [
+        {"flight": flight, "row": row, "seat": seat} for row, seat in seats
+    ]
+
+
+def hold_seats(flight, user, seats) -> SeatHold:
+    """Reserve free seats of flight for user for SEAT_HOLD_TTL seconds"""
+    with transaction.atomic():
+        flight = lock_flights({flight.id})[flight.id]
+        seat_map, held_map = flight.seats, flight.held_seats
+        if any(held_map.is_taken(row, seat) for row, seat in seats):
+            _release_expired_holds(flight, held_map)
+        taken = [
+            (flight.id, row, seat)
+            for row, seat in seats
+            if seat_map.is_taken(row, seat) or not held_map.take(row, seat)
+        ]
+        if taken:
+            raise SeatsTaken(taken)
+
+        hold = SeatHold.objects.create(
+            flight=flight,
+            user=user,
+            seats=[{"row": row, "seat": seat} for row, seat in seats],
+            expires_at=(
+                timezone.now() + timedelta(seconds=settings.SEAT_HOLD_TTL)
+            ),
+        )
+        _save_seat_maps(held_maps={flight.id: held_map})
+        bump_versions("seathold")
+        return hold
+
+
+def release_expired_holds() -> int:
+    """Delete all expired holds flight by flight, return their number"""
+    flight_ids = set(
+        SeatHold.objects.filter(expires_at__lte=timezone.now())
+        .values_list("flight_id", flat=True)
+    )
+    released = 0
+    for flight_id in sorted(flight_ids):
+        with transaction.atomic():
+            flight = lock_flights({flight_id})[flight_id]
+            held_map = flight.held_seats
+            released += _release_expired_holds(flight, held_map)
+            _save_seat_maps(held_maps={flight_id: held_map})
+    if released:
+        bump_versions("seathold")
+    return released
@@ -0,0 +1,75 @@
+import gzip
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from airport.cache import get_versions
+from airport.models import AirplaneType, Airport, City, Country, Route
+from airport.serializers import ReferenceBundleSerializer
+from airport_service.metrics import CACHE_LOOKUPS
+from airport_service.renderers import FastJSONRenderer
+
+REFERENCE_BUNDLE_KEY = "airport:reference-bundle:{}"
+REFERENCE_BUNDLE_MODELS = (
+    "country", "city", "airport", "airplanetype", "route"
+)
+
+
+def reference_bundle_version() -> str:
+    versions = get_versions(*REFERENCE_BUNDLE_MODELS)
+    signature = json.dumps(sorted(versions.items()))
+    return hashlib.sha256(signature.encode()).hexdigest()[:16]
+
+
+def build_reference_bundle(version: str) -> dict:
+    """Render reference data once as JSON and gzipped JSON bytes"""
+    data = ReferenceBundleSerializer(
+        {
+            "version": version,
+            "countries": Country.objects.all(),
+            "cities": City.objects.select_related("country"),
+            "airports": Airport.objects.select_related("closest_big_city"),
+            "airplane_types": AirplaneType.objects.all(),
+            "routes": Route.objects.select_related("source", "destination"),
+        }
+    ).data
+    content = FastJSONRenderer().render(data)
+    return {"json": content, "gzip": gzip.compress(content, mtime=0)}
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether Accept-Encoding allows gzip, "gzip;q=0" refuses it"""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    quality = qualities.get("gzip", qualities.get("*", 0.0))
+    return quality > 0
+
+
+def get_reference_bundle() -> tuple[str, dict]:
+    """Current bundle version and its content, rebuilt when stale.
+
+    Bundles are cached under their version, so any write to reference
+    models makes the next request rebuild it.
+    """
+    version = reference_bundle_version()
+    key = REFERENCE_BUNDLE_KEY.format(version)
+    bundle = cache.get(key)
+    CACHE_LOOKUPS.inc("reference_bundle", "miss" if bundle is None else "hit")
+    if bundle is None:
+        bundle = build_reference_bundle(version)
+        cache.set(key, bundle, timeout=settings.REFERENCE_BUNDLE_CACHE_TTL)
+    return version, bundle
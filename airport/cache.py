@@ -0,0 +1,114 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+
+from airport.models import ModelVersion
+from airport_service.metrics import CACHE_LOOKUPS
+
+FLIGHT_LIST_KEY = "airport:flights:list:{}"
+
+# Models rendered in flight list: flights, their tickets_available,
+# routes (with airports names), airplanes & crew names
+FLIGHT_LIST_MODELS = (
+    "flight", "ticket", "seathold", "route", "airport", "airplane", "crew"
+)
+# Filters matched case-insensitively
+CASE_INSENSITIVE_PARAMS = ("source", "destination")
+
+
+def get_versions(*names) -> dict:
+    """Current version of every model name, initialized when missing.
+
+    Versions are nanosecond timestamps of the last write, so they also
+    tell when the model data was modified. They are read from the
+    database serving the data of the request: a lagging replica gives
+    versions as old as its data, never keys newer than what it shows.
+    Missing versions are created on the primary; until a replica has
+    them, it reports 0.
+    """
+    alias = router.db_for_read(ModelVersion)
+    current = dict(
+        ModelVersion.objects.using(alias)
+        .filter(name__in=names)
+        .values_list("name", "version")
+    )
+    missing = [name for name in names if name not in current]
+    if missing:
+        primary = ModelVersion.objects.using(DEFAULT_DB_ALIAS)
+        version = time.time_ns()
+        primary.bulk_create(
+            [ModelVersion(name=name, version=version) for name in missing],
+            ignore_conflicts=True,
+        )
+        if alias == DEFAULT_DB_ALIAS:
+            current.update(
+                primary.filter(name__in=missing).values_list(
+                    "name", "version"
+                )
+            )
+        else:
+            current.update(dict.fromkeys(missing, 0))
+    return current
+
+
+def _set_versions(names) -> None:
+    version = time.time_ns()
+    ModelVersion.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+        [ModelVersion(name=name, version=version) for name in names],
+        update_conflicts=True,
+        unique_fields=["name"],
+        update_fields=["version"],
+    )
+
+
+def bump_versions(*names) -> None:
+    """Invalidate data cached under the versions of names.
+
+    Bumped once the transaction commits: a response read before is kept
+    under the old version, and the version rows are only locked briefly
+    instead of until the end of every writing transaction.
+    """
+    transaction.on_commit(lambda: _set_versions(names))
+
+
+def _normalized_params(query_params) -> list:
+    params = []
+    for name, values in query_params.lists():
+        for value in values:
+            value = value.strip()
+            if name in CASE_INSENSITIVE_PARAMS:
+                value = value.lower()
+            if value:
+                params.append((name, value))
+    return sorted(params)
+
+
+def flight_list_cache_key(request) -> str:
+    signature = json.dumps(
+        [
+            sorted(get_versions(*FLIGHT_LIST_MODELS).items()),
+            request.build_absolute_uri("/"),
+            _normalized_params(request.query_params),
+        ]
+    )
+    return FLIGHT_LIST_KEY.format(
+        hashlib.sha256(signature.encode()).hexdigest()
+    )
+
+
+def get_flight_list(request):
+    if not settings.FLIGHT_LIST_CACHE_TTL:
+        return None, None
+    key = flight_list_cache_key(request)
+    data = cache.get(key)
+    CACHE_LOOKUPS.inc("flight_list", "miss" if data is None else "hit")
+    return key, data
+
+
+def set_flight_list(key, data) -> None:
+    if key:
+        cache.set(key, data, timeout=settings.FLIGHT_LIST_CACHE_TTL)
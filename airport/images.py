@@ -0,0 +1,108 @@
+import io
+import multiprocessing
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+# Variant name: longest side bounding box
+VARIANT_SIZES = {"thumb": (160, 160), "medium": (640, 640)}
+# Variant format: Pillow format & save options
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+_executor = None
+
+
+def variant_name(name: str, variant: str, extension: str) -> str:
+    """Storage name of a variant, next to the original image"""
+    path = pathlib.PurePosixPath(name)
+    return str(path.with_name(f"{path.stem}.{variant}.{extension}"))
+
+
+def variant_names(name: str) -> dict:
+    return {
+        variant: {
+            extension: variant_name(name, variant, extension)
+            for extension in VARIANT_FORMATS
+        }
+        for variant in VARIANT_SIZES
+    }
+
+
+def variant_urls(name: str, request=None):
+    """Variant URLs of stored image by size & format, None without image"""
+    if not name:
+        return None
+    urls = {}
+    for variant, names in variant_names(name).items():
+        urls[variant] = {}
+        for extension, target in names.items():
+            url = default_storage.url(target)
+            urls[variant][extension] = (
+                request.build_absolute_uri(url) if request else url
+            )
+    return urls
+
+
+def render_variants(name: str) -> list[str]:
+    """Resize stored image into every variant, return their names"""
+    with default_storage.open(name) as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    # Variants of files stored before content addressing keep their names
+    save = getattr(default_storage, "save_derived", default_storage.save)
+    saved = []
+    for variant, size in VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail(size, Image.LANCZOS)
+        for extension, (image_format, options) in VARIANT_FORMATS.items():
+            content = io.BytesIO()
+            if image_format == "JPEG" and resized.mode != "RGB":
+                resized.convert("RGB").save(content, image_format, **options)
+            else:
+                resized.save(content, image_format, **options)
+            target = variant_name(name, variant, extension)
+            if default_storage.exists(target):
+                default_storage.delete(target)
+            saved.append(save(target, ContentFile(content.getvalue())))
+    return saved
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        )
+    return _executor
+
+
+def schedule_variants(name: str) -> None:
+    """Render variants of stored image once the transaction commits.
+
+    Resizing runs in a process pool of IMAGE_VARIANT_WORKERS processes,
+    off the request thread; with 0 workers it runs in place.
+    """
+    if not name:
+        return
+
+    def submit():
+        if settings.IMAGE_VARIANT_WORKERS:
+            get_executor().submit(render_variants, name)
+        else:
+            render_variants(name)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,175 @@
+import bisect
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+
+from airport.models import Flight
+from airport.search import search_airports
+
+
+@dataclass(frozen=True)
+class Leg:
+    flight_id: int
+    source_id: int
+    destination_id: int
+    departure_time: datetime
+    arrival_time: datetime
+
+
+@dataclass
+class Itinerary:
+    flights: list
+
+    @property
+    def departure_time(self) -> datetime:
+        return self.flights[0].departure_time
+
+    @property
+    def arrival_time(self) -> datetime:
+        return self.flights[-1].arrival_time
+
+    @property
+    def stops(self) -> int:
+        return len(self.flights) - 1
+
+    @property
+    def duration(self) -> int:
+        """Total travel time in minutes"""
+        return int(
+            (self.arrival_time - self.departure_time).total_seconds() // 60
+        )
+
+
+class FlightIndex:
+    """Adjacency index: source airport -> legs ordered by departure"""
+
+    def __init__(self, legs) -> None:
+        self._legs = defaultdict(list)
+        for leg in sorted(legs, key=lambda leg: leg.departure_time):
+            self._legs[leg.source_id].append(leg)
+        self._departures = {
+            airport_id: [leg.departure_time for leg in airport_legs]
+            for airport_id, airport_legs in self._legs.items()
+        }
+
+    def departing(self, airport_id, earliest, latest) -> list[Leg]:
+        departures = self._departures.get(airport_id, [])
+        start = bisect.bisect_left(departures, earliest)
+        end = bisect.bisect_right(departures, latest)
+        return self._legs.get(airport_id, [])[start:end]
+
+
+def matching_airports(name: str) -> set[int]:
+    return set(search_airports(name).values_list("id", flat=True))
+
+
+def _legs(**filters) -> list[Leg]:
+    return [
+        Leg(*values)
+        for values in Flight.objects.with_tickets_available()
+        .filter(**filters)
+        .order_by()
+        .values_list(
+            "id",
+            "route__source_id",
+            "route__destination_id",
+            "departure_time",
+            "arrival_time",
+        )
+    ]
+
+
+def find_itineraries(
+    source: str,
+    destination: str,
+    departure_date: date,
+    max_stops: int = 2,
+    min_connection: int = 45,
+    max_connection: int = 24 * 60,
+    seats: int = 1,
+    limit: int = 20,
+) -> list[Itinerary]:
+    """Find direct & connecting flights departing on given date.
+
+    Connections are searched layer by layer: every layer loads the legs
+    departing from the airports reached so far within the connection
+    window into a FlightIndex, so at most max_stops + 1 flat queries are
+    made whatever the size of the route graph.
+    """
+    source_ids = matching_airports(source)
+    destination_ids = matching_airports(destination)
+    if not source_ids or not destination_ids:
+        return []
+
+    min_gap = timedelta(minutes=min_connection)
+    max_gap = timedelta(minutes=max_connection)
+    day_start = timezone.make_aware(
+        datetime.combine(departure_date, time.min)
+    )
+
+    found = []
+    frontier = []
+    for leg in _legs(
+        route__source_id__in=source_ids,
+        departure_time__gte=day_start,
+        departure_time__lt=day_start + timedelta(days=1),
+        tickets_available__gte=seats,
+    ):
+        if leg.destination_id in destination_ids:
+            found.append([leg])
+        else:
+            frontier.append([leg])
+
+    for stop in range(1, max_stops + 1):
+        if not frontier:
+            break
+        last_layer = stop == max_stops
+        reached = [path[-1] for path in frontier]
+        filters = {
+            "route__source_id__in": {leg.destination_id for leg in reached},
+            "departure_time__gte": (
+                min(leg.arrival_time for leg in reached) + min_gap
+            ),
+            "departure_time__lte": (
+                max(leg.arrival_time for leg in reached) + max_gap
+            ),
+            "tickets_available__gte": seats,
+        }
+        if last_layer:
+            filters["route__destination_id__in"] = destination_ids
+        index = FlightIndex(_legs(**filters))
+
+        next_frontier = []
+        for path in frontier:
+            visited = {path[0].source_id} | {
+                leg.destination_id for leg in path
+            }
+            arrival = path[-1].arrival_time
+            for leg in index.departing(
+                path[-1].destination_id, arrival + min_gap, arrival + max_gap
+            ):
+                if leg.destination_id in visited:
+                    continue
+                if leg.destination_id in destination_ids:
+                    found.append(path + [leg])
+                elif not last_layer:
+                    next_frontier.append(path + [leg])
+        frontier = next_frontier
+
+    found.sort(key=lambda path: (path[-1].arrival_time, len(path)))
+    found = found[:limit]
+
+    flights = (
+        Flight.objects.select_related(
+            "route__source", "route__destination", "airplane"
+        )
+        .with_tickets_available()
+        .prefetch_related("crew")
+        .in_bulk({leg.flight_id for path in found for leg in path})
+    )
+    return [
+        Itinerary(flights=[flights[leg.flight_id] for leg in path])
+        for path in found
+    ]
@@ -0,0 +1,67 @@
+import time
+
+from django.core.management import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from airport_service.db.pool import pool_metrics
+
+# Connection settings compared, as set in DATABASES
+MODES = {
+    "per-request": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "persistent": {"CONN_MAX_AGE": None, "CONN_HEALTH_CHECKS": True},
+}
+
+
+class Command(BaseCommand):
+    """Django command to measure the connection overhead of requests.
+
+    Runs --requests requests of one query, sending request_started and
+    request_finished like the request handler does, once with the
+    connection closed after every request (returned to the pool with the
+    pool backend) and once kept open with health checks.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        self.stdout.write(
+            f"{connection.settings_dict['ENGINE']} "
+            f"{connection.settings_dict['NAME']}"
+        )
+        saved = {
+            name: connection.settings_dict[name]
+            for name in MODES["persistent"]
+        }
+        try:
+            for mode, conn_settings in MODES.items():
+                connection.close()
+                connection.settings_dict.update(conn_settings)
+                elapsed = self.run_requests(connection, options["requests"])
+                self.stdout.write(
+                    f"{mode:>12}: "
+                    f"{elapsed / options['requests'] * 1000:8.3f} ms "
+                    f"per request"
+                )
+        finally:
+            connection.close()
+            connection.settings_dict.update(saved)
+
+        for alias, metrics in pool_metrics().items():
+            values = ", ".join(
+                f"{name}={value}" for name, value in metrics.items()
+            )
+            self.stdout.write(f"pool {alias}: {values}")
+
+    def run_requests(self, connection, count: int) -> float:
+        started = time.perf_counter()
+        for _ in range(count):
+            request_started.send(sender=self.__class__)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            request_finished.send(sender=self.__class__)
+        return time.perf_counter() - started
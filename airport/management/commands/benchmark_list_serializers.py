@@ -0,0 +1,152 @@
+import math
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Crew,
+    Flight,
+    Route,
+)
+from airport.serializers import (
+    CityListSerializer,
+    FlightListSerializer,
+    RouteListSerializer,
+)
+from airport.values import (
+    CityListValuesSerializer,
+    FlightListValuesSerializer,
+    RouteListValuesSerializer,
+)
+
+
+class Command(BaseCommand):
+    """Django command to compare model and .values() list serializers.
+
+    For every row count creates that many flights, routes and cities
+    inside a transaction that is rolled back afterwards, then renders
+    them with both serializers, reporting the best of --repeat runs
+    (queries included).
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[1000, 10000]
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        for rows in options["rows"]:
+            with transaction.atomic():
+                self.create_rows(rows)
+                for name, serializer, values_serializer, queryset in (
+                    (
+                        "flights",
+                        FlightListSerializer,
+                        FlightListValuesSerializer,
+                        Flight.objects.select_related(
+                            "route__source", "route__destination", "airplane"
+                        )
+                        .with_tickets_available()
+                        .prefetch_related("crew"),
+                    ),
+                    (
+                        "routes",
+                        RouteListSerializer,
+                        RouteListValuesSerializer,
+                        Route.objects.select_related(
+                            "source", "destination"
+                        ),
+                    ),
+                    (
+                        "cities",
+                        CityListSerializer,
+                        CityListValuesSerializer,
+                        City.objects.select_related("country"),
+                    ),
+                ):
+                    model_time = self.best_time(
+                        lambda: serializer(queryset.all(), many=True).data,
+                        options["repeat"]
+                    )
+                    values_time = self.best_time(
+                        lambda: values_serializer().render(
+                            values_serializer().project(queryset.all())
+                        ),
+                        options["repeat"]
+                    )
+                    self.stdout.write(
+                        f"{name:>8} x {rows}: "
+                        f"model {model_time * 1000:8.1f} ms, "
+                        f"values {values_time * 1000:8.1f} ms "
+                        f"({model_time / values_time:.1f}x)"
+                    )
+                transaction.set_rollback(True)
+
+    @staticmethod
+    def best_time(render, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    @staticmethod
+    def create_rows(rows: int) -> None:
+        suffix = uuid.uuid4().hex[:8]
+        country = Country.objects.create(name=f"Benchmark {suffix}")
+        cities = City.objects.bulk_create(
+            City(name=f"Benchmark {suffix} {index}", country=country)
+            for index in range(rows)
+        )
+        size = math.isqrt(rows) + 2
+        airports = Airport.objects.bulk_create(
+            Airport(
+                name=f"Benchmark {suffix} {index}",
+                closest_big_city=cities[index]
+            )
+            for index in range(size)
+        )
+        routes = Route.objects.bulk_create(
+            Route(source=source, destination=destination, distance=100)
+            for source in airports
+            for destination in airports
+            if source != destination
+        )[:rows]
+        airplane = Airplane.objects.create(
+            name=f"Benchmark {suffix}",
+            rows=30,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(
+                name=f"Benchmark {suffix}"
+            ),
+        )
+        crew = Crew.objects.bulk_create(
+            Crew(first_name="Benchmark", last_name=str(index))
+            for index in range(4)
+        )
+        now = timezone.now()
+        flights = Flight.objects.bulk_create(
+            Flight(
+                route=routes[index % len(routes)],
+                airplane=airplane,
+                departure_time=now + timedelta(minutes=index),
+                arrival_time=now + timedelta(minutes=index + 90),
+            )
+            for index in range(rows)
+        )
+        Flight.crew.through.objects.bulk_create(
+            Flight.crew.through(flight_id=flight.id, crew_id=member.id)
+            for flight in flights
+            for member in crew[:2]
+        )
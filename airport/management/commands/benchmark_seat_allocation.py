@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from airport.allocation import SeatsTaken
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Order,
+    Route,
+)
+from airport.serializers import OrderSerializer
+
+
+class Command(BaseCommand):
+    """Django command to hammer one flight with parallel orders.
+
+    Creates a temporary flight in the configured database, books it from
+    many threads at once through OrderSerializer and reports throughput
+    and conflict rate. Temporary data is removed afterwards.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--orders", type=int, default=25, help="Orders per thread"
+        )
+        parser.add_argument(
+            "--seats", type=int, default=2, help="Seats per order"
+        )
+        parser.add_argument("--rows", type=int, default=30)
+        parser.add_argument("--seats-in-row", type=int, default=6)
+
+    def handle(self, *args, **options):
+        suffix = uuid.uuid4().hex[:8]
+        user = get_user_model().objects.create_user(
+            f"benchmark-{suffix}@airport.local", uuid.uuid4().hex
+        )
+        airplane = Airplane.objects.create(
+            name=f"Benchmark {suffix}",
+            rows=options["rows"],
+            seats_in_row=options["seats_in_row"],
+            airplane_type=AirplaneType.objects.create(
+                name=f"Benchmark {suffix}"
+            ),
+        )
+        route = Route.objects.create(
+            source=Airport.objects.create(name=f"Benchmark A {suffix}"),
+            destination=Airport.objects.create(name=f"Benchmark B {suffix}"),
+            distance=1,
+        )
+        flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timedelta(hours=1),
+        )
+
+        results = Counter()
+        lock = threading.Lock()
+
+        def book():
+            try:
+                for _ in range(options["orders"]):
+                    seats = random.sample(
+                        [
+                            (row, seat)
+                            for row in range(1, airplane.rows + 1)
+                            for seat in range(1, airplane.seats_in_row + 1)
+                        ],
+                        options["seats"],
+                    )
+                    serializer = OrderSerializer(
+                        data={
+                            "tickets": [
+                                {"row": row, "seat": seat, "flight": flight.id}
+                                for row, seat in seats
+                            ]
+                        }
+                    )
+                    serializer.is_valid(raise_exception=True)
+                    try:
+                        serializer.save(user=user)
+                        outcome = "booked"
+                    except SeatsTaken:
+                        outcome = "conflict"
+                    except DatabaseError:
+                        outcome = "error"
+                    with lock:
+                        results[outcome] += 1
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=book) for _ in range(options["threads"])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        flight.refresh_from_db()
+        total = sum(results.values())
+        self.stdout.write(
+            f"{connection.vendor}: {options['threads']} threads, "
+            f"{total} orders of {options['seats']} seats "
+            f"in {elapsed:.2f}s ({total / elapsed:.1f} orders/s)"
+        )
+        self.stdout.write(
+            f"booked: {results['booked']}, "
+            f"conflicts: {results['conflict']} "
+            f"({results['conflict'] / total:.1%}), "
+            f"errors: {results['error']}, "
+            f"tickets sold: {flight.tickets_sold}/{airplane.capacity}, "
+            f"tickets stored: {flight.tickets.count()}"
+        )
+
+        Order.objects.filter(user=user).delete()
+        flight.delete()
+        route.source.delete()
+        route.destination.delete()
+        airplane.airplane_type.delete()
+        user.delete()
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management import BaseCommand, CommandError
+from django.db import models
+from django.utils import timezone
+
+from airport.images import variant_names
+from airport_service.storage import BLOB_DIR
+
+
+class Command(BaseCommand):
+    """Django command to delete media blobs no file field refers to.
+
+    Variants of referenced blobs are kept. Blobs younger than --grace
+    seconds are kept too, as their upload may not be committed yet.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace", type=int, default=3600)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if not hasattr(default_storage, "purge"):
+            raise CommandError(
+                "Default storage is not a content addressed storage"
+            )
+
+        referenced = set()
+        for name in self.referenced_names():
+            referenced.add(name)
+            for names in variant_names(name).values():
+                referenced.update(names.values())
+
+        deadline = timezone.now() - timedelta(seconds=options["grace"])
+        removed = removed_size = kept = 0
+        for name in self.blob_names():
+            if (
+                name in referenced
+                or default_storage.get_modified_time(name) > deadline
+            ):
+                kept += 1
+                continue
+            removed += 1
+            removed_size += default_storage.size(name)
+            if not options["dry_run"]:
+                default_storage.purge(name)
+
+        action = "Would remove" if options["dry_run"] else "Removed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {removed} blobs ({removed_size} bytes), "
+                f"kept {kept}"
+            )
+        )
+
+    @staticmethod
+    def referenced_names():
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, models.FileField):
+                    yield from (
+                        model._default_manager
+                        .exclude(**{field.name: ""})
+                        .exclude(**{f"{field.name}__isnull": True})
+                        .values_list(field.name, flat=True)
+                        .iterator()
+                    )
+
+    @staticmethod
+    def blob_names():
+        if not default_storage.exists(BLOB_DIR):
+            return
+        directories, _ = default_storage.listdir(BLOB_DIR)
+        for directory in sorted(directories):
+            _, files = default_storage.listdir(f"{BLOB_DIR}/{directory}")
+            for file_name in sorted(files):
+                yield f"{BLOB_DIR}/{directory}/{file_name}"
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from airport.images import get_executor, render_variants
+from airport.models import Airplane, Crew
+
+
+class Command(BaseCommand):
+    """Django command to (re)build resized variants of all photos"""
+
+    def handle(self, *args, **options):
+        names = [
+            name
+            for name in (
+                *Crew.objects.values_list("photo", flat=True),
+                *Airplane.objects.values_list("airplane_photo", flat=True),
+            )
+            if name
+        ]
+        if settings.IMAGE_VARIANT_WORKERS:
+            results = get_executor().map(render_variants, names)
+        else:
+            results = map(render_variants, names)
+        variants = sum(len(saved) for saved in results)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {variants} variants of {len(names)} photos"
+            )
+        )
@@ -0,0 +1,15 @@
+from django.core.management import BaseCommand
+
+from airport.models import Airport
+from airport.search import index_airports
+
+
+class Command(BaseCommand):
+    """Django command to rebuild airport & city names search index"""
+
+    def handle(self, *args, **options):
+        airports = Airport.objects.select_related("closest_big_city")
+        index_airports(airports)
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {airports.count()} airports")
+        )
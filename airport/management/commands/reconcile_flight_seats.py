@@ -0,0 +1,54 @@
+from collections import defaultdict
+
+from django.core.management import BaseCommand
+
+from airport.models import Flight, SeatHold, Ticket
+
+
+class Command(BaseCommand):
+    """Django command to recalculate flight seat maps & sold counters"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "flight_ids",
+            nargs="*",
+            type=int,
+            help="Flights to reconcile (all flights by default)",
+        )
+
+    def handle(self, *args, **options):
+        flights = Flight.objects.select_related("airplane").order_by("id")
+        tickets = Ticket.objects.all()
+        holds = SeatHold.objects.all()
+        if options["flight_ids"]:
+            flights = flights.filter(id__in=options["flight_ids"])
+            tickets = tickets.filter(flight_id__in=options["flight_ids"])
+            holds = holds.filter(flight_id__in=options["flight_ids"])
+
+        seats = defaultdict(list)
+        for flight_id, row, seat in tickets.values_list(
+            "flight_id", "row", "seat"
+        ):
+            seats[flight_id].append((row, seat))
+        held = defaultdict(list)
+        for hold in holds:
+            held[hold.flight_id] += hold.seat_list
+
+        fixed = 0
+        for flight in flights.iterator():
+            seat_map = bytes(flight.seat_map)
+            tickets_sold = flight.tickets_sold
+            flight.rebuild_seat_map(seats.get(flight.id, []))
+            flight.rebuild_held_map(held.get(flight.id, []))
+            if (seat_map, tickets_sold) != (
+                flight.seat_map, flight.tickets_sold
+            ):
+                fixed += 1
+                self.stdout.write(
+                    f"Flight {flight.id}: tickets_sold "
+                    f"{tickets_sold} -> {flight.tickets_sold}"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled flights, {fixed} fixed")
+        )
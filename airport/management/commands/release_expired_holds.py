@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+
+from airport.allocation import release_expired_holds
+
+
+class Command(BaseCommand):
+    """Django command to release seats of all expired seat holds"""
+
+    def handle(self, *args, **options):
+        released = release_expired_holds()
+        self.stdout.write(
+            self.style.SUCCESS(f"Released {released} expired seat holds")
+        )
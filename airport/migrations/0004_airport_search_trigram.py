@@ -0,0 +1,58 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from airport.search import trigrams
+
+
+def fill_search_trigrams(apps, schema_editor):
+    Airport = apps.get_model("airport", "Airport")
+    AirportSearchTrigram = apps.get_model("airport", "AirportSearchTrigram")
+    AirportSearchTrigram.objects.bulk_create(
+        AirportSearchTrigram(airport=airport, trigram=trigram)
+        for airport in Airport.objects.select_related("closest_big_city")
+        for trigram in trigrams(airport.name) | trigrams(
+            airport.closest_big_city.name if airport.closest_big_city else ""
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0003_flight_tickets_sold"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AirportSearchTrigram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("trigram", models.CharField(max_length=3)),
+                (
+                    "airport",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_trigrams",
+                        to="airport.airport",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="airportsearchtrigram",
+            constraint=models.UniqueConstraint(
+                fields=("trigram", "airport"), name="unique_trigram_airport"
+            ),
+        ),
+        migrations.RunPython(fill_search_trigrams, migrations.RunPython.noop),
+    ]
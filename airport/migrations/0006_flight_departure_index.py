@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-17 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0005_seat_hold"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["-departure_time", "-id"],
+                name="airport_fli_departu_a1f2c8_idx",
+            ),
+        ),
+    ]
@@ -2,11 +2,13 @@ import pathlib
 import uuid
 
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 from django.db.models import F
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
+from airport.seatmap import SeatMap
+
 
 def set_filename(new_filename, filename: str) -> pathlib.Path:
     return (f"{slugify(new_filename)}-{uuid.uuid4()}"
@@ -72,6 +74,28 @@ class Airport(models.Model):
         return f"{self.name} | {self.closest_big_city.name}"
 
 
+class AirportSearchTrigram(models.Model):
+    """Lowercase trigrams of airport & its closest big city names"""
+
+    airport = models.ForeignKey(
+        Airport,
+        on_delete=models.CASCADE,
+        related_name="search_trigrams"
+    )
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("trigram", "airport"),
+                name="unique_trigram_airport"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.trigram} | {self.airport_id}"
+
+
 class Route(models.Model):
     source = models.ForeignKey(
         Airport,
@@ -150,6 +174,17 @@ class Airplane(models.Model):
         return f"{self.name} | {self.airplane_type.name}"
 
 
+class FlightQuerySet(models.QuerySet):
+    def with_tickets_available(self):
+        return self.annotate(
+            tickets_available=(
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - F("tickets_sold")
+                - F("seats_held")
+            )
+        )
+
+
 class Flight(models.Model):
     route = models.ForeignKey(
         Route,
@@ -164,9 +199,19 @@ class Flight(models.Model):
     crew = models.ManyToManyField(Crew, related_name="flights")
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    seat_map = models.BinaryField(default=b"", editable=False)
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    held_map = models.BinaryField(default=b"", editable=False)
+    seats_held = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = FlightQuerySet.as_manager()
 
     class Meta:
         ordering = ("-departure_time", )
+        indexes = [
+            # Flight list cursor pages
+            models.Index(fields=["-departure_time", "-id"]),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=models.Q(arrival_time__gt=F("departure_time")),
@@ -178,6 +223,77 @@ class Flight(models.Model):
             )
         ]
 
+    @property
+    def seats(self) -> SeatMap:
+        return SeatMap.for_flight(self)
+
+    @property
+    def held_seats(self) -> SeatMap:
+        return SeatMap.for_flight(self, "held_map")
+
+    @property
+    def occupied_seats(self) -> SeatMap:
+        """Seats either sold or held"""
+        return self.seats | self.held_seats
+
+    @staticmethod
+    def update_seat_map(flight_id, take=(), release=()):
+        """Apply taken/released seats to the stored seat map of flight"""
+        with transaction.atomic():
+            flight = (
+                Flight.objects.select_for_update(of=("self", ))
+                .select_related("airplane")
+                .only("seat_map", "airplane__rows", "airplane__seats_in_row")
+                .filter(pk=flight_id)
+                .first()
+            )
+            if flight is None:
+                return
+            seat_map = flight.seats
+            sold_delta = 0
+            for row, seat in release:
+                sold_delta -= seat_map.release(row, seat)
+            for row, seat in take:
+                sold_delta += seat_map.take(row, seat)
+            Flight.objects.filter(pk=flight_id).update(
+                seat_map=seat_map.to_bytes(),
+                tickets_sold=F("tickets_sold") + sold_delta
+            )
+
+    def rebuild_seat_map(self, seats=None):
+        """Recalculate stored seat map and sold counter from tickets"""
+        if seats is None:
+            seats = self.tickets.values_list("row", "seat")
+        seat_map = SeatMap(self.airplane.rows, self.airplane.seats_in_row)
+        for row, seat in seats:
+            seat_map.take(row, seat)
+        self.seat_map = seat_map.to_bytes()
+        self.tickets_sold = seat_map.count()
+        Flight.objects.filter(pk=self.pk).update(
+            seat_map=self.seat_map,
+            tickets_sold=self.tickets_sold
+        )
+
+    def rebuild_held_map(self, seats=None):
+        """Recalculate stored held seats map and counter from holds"""
+        if seats is None:
+            seats = [
+                (seat["row"], seat["seat"])
+                for hold_seats in self.holds.values_list("seats", flat=True)
+                for seat in hold_seats
+            ]
+        held_map = SeatMap(self.airplane.rows, self.airplane.seats_in_row)
+        for row, seat in seats:
+            # Holds expire shortly, seats of a former layout are dropped
+            if row <= held_map.rows and seat <= held_map.seats_in_row:
+                held_map.take(row, seat)
+        self.held_map = held_map.to_bytes()
+        self.seats_held = held_map.count()
+        Flight.objects.filter(pk=self.pk).update(
+            held_map=self.held_map,
+            seats_held=self.seats_held
+        )
+
     def __str__(self):
         return f"{self.departure_time} - {self.arrival_time} | {self.route}"
 
@@ -262,3 +378,41 @@ class Ticket(models.Model):
             f"Order: {self.order} | "
             f"Flight: {self.flight} - (row: {self.row}, seat: {self.seat})"
         )
+
+
+class SeatHold(models.Model):
+    """Seats of flight reserved for user until expires_at"""
+
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.CASCADE,
+        related_name="holds"
+    )
+    user = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    seats = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ("expires_at", )
+
+    @property
+    def seat_list(self) -> list[tuple[int, int]]:
+        return [(seat["row"], seat["seat"]) for seat in self.seats]
+
+    def __str__(self):
+        return f"{self.flight} | {self.seat_list} | till {self.expires_at}"
+
+
+class ModelVersion(models.Model):
+    """Version of the data of a model, keys responses cached from it"""
+
+    name = models.CharField(max_length=64, primary_key=True)
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.name} | {self.version}"
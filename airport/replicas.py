@@ -0,0 +1,25 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from airport_service.db.routers import (
+    choose_replica,
+    is_pinned,
+    read_replica
+)
+
+
+class ReplicaReadMixin:
+    # Safe requests read from DATABASE_REPLICAS, unless the user wrote
+    # within REPLICA_PIN_SECONDS (see ReadYourWritesMiddleware).
+    # Authentication & permission checks still read from the primary.
+
+    def dispatch(self, request, *args, **kwargs):
+        token = read_replica.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            read_replica.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned(request.user):
+            read_replica.set(choose_replica())
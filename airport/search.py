@@ -0,0 +1,48 @@
+from django.db.models import Count, Q
+
+from airport.models import Airport, AirportSearchTrigram
+
+
+def trigrams(text: str) -> set[str]:
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def index_airports(airports) -> None:
+    """Rebuild search trigrams of airports"""
+    airports = list(airports)
+    search_trigrams = []
+    for airport in airports:
+        city = airport.closest_big_city
+        names = trigrams(airport.name) | trigrams(city.name if city else "")
+        search_trigrams += [
+            AirportSearchTrigram(airport=airport, trigram=trigram)
+            for trigram in names
+        ]
+    AirportSearchTrigram.objects.filter(airport__in=airports).delete()
+    AirportSearchTrigram.objects.bulk_create(search_trigrams)
+
+
+def search_airports(text: str, with_city: bool = True):
+    """Airports which name (or city name) contains text, case-insensitive.
+
+    Candidates are narrowed with the indexed trigram table first, so
+    the icontains check runs only on airports having every trigram of
+    text. Texts shorter than 3 characters fall back to icontains only.
+    """
+    lookup = Q(name__icontains=text)
+    if with_city:
+        lookup |= Q(closest_big_city__name__icontains=text)
+    airports = Airport.objects.filter(lookup)
+
+    text_trigrams = trigrams(text)
+    if text_trigrams:
+        candidates = (
+            AirportSearchTrigram.objects.filter(trigram__in=text_trigrams)
+            .values("airport")
+            .annotate(matched=Count("trigram"))
+            .filter(matched=len(text_trigrams))
+            .values("airport")
+        )
+        airports = airports.filter(id__in=candidates)
+    return airports
@@ -0,0 +1,148 @@
+import base64
+from itertools import islice
+
+
+class SeatMap:
+    """Bitmap of taken seats of a flight.
+
+    Seat (row, seat) is stored in bit (row - 1) * seats_in_row + (seat - 1),
+    most significant bit first inside every byte.
+    """
+
+    ENCODINGS = ("base64", "rle")
+
+    def __init__(self, rows: int, seats_in_row: int, data=b"") -> None:
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self.capacity = rows * seats_in_row
+        size = (self.capacity + 7) // 8
+        self.data = bytearray(bytes(data or b"")[:size].ljust(size, b"\0"))
+
+    @classmethod
+    def for_flight(cls, flight, field: str = "seat_map") -> "SeatMap":
+        return cls(
+            flight.airplane.rows,
+            flight.airplane.seats_in_row,
+            getattr(flight, field)
+        )
+
+    def __or__(self, other: "SeatMap") -> "SeatMap":
+        return SeatMap(
+            self.rows,
+            self.seats_in_row,
+            bytes(left | right for left, right in zip(self.data, other.data))
+        )
+
+    def _index(self, row: int, seat: int) -> int:
+        if not (
+            1 <= row <= self.rows
+            and 1 <= seat <= self.seats_in_row
+        ):
+            raise ValueError(
+                f"Seat (row: {row}, seat: {seat}) is out of range: "
+                f"({self.rows}, {self.seats_in_row})"
+            )
+        return (row - 1) * self.seats_in_row + seat - 1
+
+    def is_taken(self, row: int, seat: int) -> bool:
+        index = self._index(row, seat)
+        return bool(self.data[index >> 3] & (0x80 >> (index & 7)))
+
+    def take(self, row: int, seat: int) -> bool:
+        """Mark seat as taken, return False if it was taken already"""
+        index = self._index(row, seat)
+        mask = 0x80 >> (index & 7)
+        if self.data[index >> 3] & mask:
+            return False
+        self.data[index >> 3] |= mask
+        return True
+
+    def release(self, row: int, seat: int) -> bool:
+        """Mark seat as free, return False if it was free already"""
+        index = self._index(row, seat)
+        mask = 0x80 >> (index & 7)
+        if not self.data[index >> 3] & mask:
+            return False
+        self.data[index >> 3] &= ~mask & 0xFF
+        return True
+
+    def taken(self):
+        """Yield taken (row, seat) pairs ordered by row and seat"""
+        for byte_index, byte in enumerate(self.data):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (0x80 >> bit):
+                    index = byte_index * 8 + bit
+                    if index >= self.capacity:
+                        return
+                    row, seat = divmod(index, self.seats_in_row)
+                    yield row + 1, seat + 1
+
+    def free(self):
+        """Yield free (row, seat) pairs ordered by row and seat"""
+        for byte_index, byte in enumerate(self.data):
+            if byte == 0xFF:
+                continue
+            for bit in range(8):
+                if not byte & (0x80 >> bit):
+                    index = byte_index * 8 + bit
+                    if index >= self.capacity:
+                        return
+                    row, seat = divmod(index, self.seats_in_row)
+                    yield row + 1, seat + 1
+
+    def find_free(self, count: int, adjacent: bool = False):
+        """First count free seats, None when there are not enough.
+
+        With adjacent=True seats are side by side in one row: every row
+        is masked out of the bitmap as an integer and runs of count free
+        seats are found with count - 1 shift-and operations.
+        """
+        if not adjacent:
+            seats = list(islice(self.free(), count))
+            return seats if len(seats) == count else None
+        if count > self.seats_in_row:
+            return None
+
+        bits = int.from_bytes(self.data, "big")
+        total = len(self.data) * 8
+        row_mask = (1 << self.seats_in_row) - 1
+        for row in range(self.rows):
+            shift = total - (row + 1) * self.seats_in_row
+            free = ~(bits >> shift) & row_mask
+            # Bit p stays set when seats at bits p, p - 1, ... are free
+            runs = free
+            for offset in range(1, count):
+                runs &= free << offset
+            if runs:
+                first = self.seats_in_row - runs.bit_length() + 1
+                return [(row + 1, first + seat) for seat in range(count)]
+        return None
+
+    def count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.data)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.data)
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.data).decode("ascii")
+
+    def to_rle(self) -> list[int]:
+        """Lengths of alternating free/taken runs, starting with free"""
+        runs = []
+        current, length = False, 0
+        for index in range(self.capacity):
+            value = bool(self.data[index >> 3] & (0x80 >> (index & 7)))
+            if value != current:
+                runs.append(length)
+                current, length = value, 0
+            length += 1
+        runs.append(length)
+        return runs
+
+    def encode(self, encoding: str):
+        if encoding == "rle":
+            return self.to_rle()
+        return self.to_base64()
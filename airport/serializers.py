@@ -1,7 +1,13 @@
 from django.db import transaction
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator
 
+from airport.allocation import assign_seats, book_tickets, hold_seats
+from airport.images import variant_urls
 from airport.models import (
     Country,
     City,
@@ -12,10 +18,32 @@ from airport.models import (
     Airplane,
     Flight,
     Ticket,
-    Order
+    Order,
+    SeatHold
 )
 
 
+@extend_schema_field(
+    {
+        "type": "object",
+        "nullable": True,
+        "description": "Resized image URLs by size (thumb, medium) "
+                       "and format (webp, jpeg)",
+        "additionalProperties": {
+            "type": "object",
+            "additionalProperties": {"type": "string", "format": "uri"},
+        },
+    }
+)
+class ImageVariantsField(serializers.Field):
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return variant_urls(value.name, self.context.get("request"))
+
+
 class CountrySerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -76,17 +104,27 @@ class RouteDetailSerializer(RouteSerializer):
 
 
 class CrewSerializer(serializers.ModelSerializer):
+    photo_variants = ImageVariantsField(source="photo")
 
     class Meta:
         model = Crew
-        fields = ("id", "first_name", "last_name", "full_name", "photo")
+        fields = (
+            "id",
+            "first_name",
+            "last_name",
+            "full_name",
+            "photo",
+            "photo_variants"
+        )
         read_only_fields = ("full_name", "photo",)
 
 
 class CrewPhotoSerializer(serializers.ModelSerializer):
+    photo_variants = ImageVariantsField(source="photo")
+
     class Meta:
         model = Crew
-        fields = ("id", "full_name", "photo")
+        fields = ("id", "full_name", "photo", "photo_variants")
         read_only_fields = ("full_name", )
 
 
@@ -115,6 +153,10 @@ class AirplaneListSerializer(AirplaneSerializer):
         slug_field="name",
         read_only=True
     )
+    airplane_photo_variants = ImageVariantsField(source="airplane_photo")
+
+    class Meta(AirplaneSerializer.Meta):
+        fields = AirplaneSerializer.Meta.fields + ("airplane_photo_variants",)
 
 
 class AirplanePhotoSerializer(serializers.ModelSerializer):
@@ -123,9 +165,17 @@ class AirplanePhotoSerializer(serializers.ModelSerializer):
         read_only=True
     )
 
+    airplane_photo_variants = ImageVariantsField(source="airplane_photo")
+
     class Meta:
         model = Airplane
-        fields = ("id", "name", "airplane_type", "airplane_photo")
+        fields = (
+            "id",
+            "name",
+            "airplane_type",
+            "airplane_photo",
+            "airplane_photo_variants"
+        )
         read_only_fields = ("name", "airplane_type", )
 
 
@@ -156,9 +206,12 @@ class FlightListSerializer(FlightSerializer):
         read_only=True
     )
     airplane_image = serializers.ImageField(
-        source="airplane.image",
+        source="airplane.airplane_photo",
         read_only=True
     )
+    airplane_image_variants = ImageVariantsField(
+        source="airplane.airplane_photo"
+    )
     crew = serializers.SlugRelatedField(
         many=True, read_only=True, slug_field="full_name"
     )
@@ -178,11 +231,30 @@ class FlightListSerializer(FlightSerializer):
             "airplane_capacity",
             "tickets_available",
             "airplane_image",
+            "airplane_image_variants",
             "crew",
         )
 
 
+class TicketFlightField(serializers.PrimaryKeyRelatedField):
+    """Flight with airplane, fetched once per request for all its tickets"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault(
+            "queryset", Flight.objects.select_related("airplane")
+        )
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        flights = self.context.setdefault("ticket_flights", {})
+        if str(data) not in flights:
+            flights[str(data)] = super().to_internal_value(data)
+        return flights[str(data)]
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    flight = TicketFlightField()
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
         Ticket.validate_ticket(
@@ -196,6 +268,8 @@ class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "flight")
+        # Seats uniqueness is checked for all tickets at once on create
+        validators = []
 
 
 class TicketListSerializer(TicketSerializer):
@@ -212,9 +286,7 @@ class FlightDetailSerializer(FlightSerializer):
     route = RouteDetailSerializer(many=False, read_only=True)
     airplane = AirplaneListSerializer(many=False, read_only=True)
     crew = CrewSerializer(many=True)
-    taken_places = TicketSeatsSerializer(
-        source="tickets", many=True, read_only=True
-    )
+    taken_places = serializers.SerializerMethodField()
 
     class Meta:
         model = Flight
@@ -228,22 +300,229 @@ class FlightDetailSerializer(FlightSerializer):
             "crew"
         )
 
+    @extend_schema_field(TicketSeatsSerializer(many=True))
+    def get_taken_places(self, obj):
+        return [
+            {"row": row, "seat": seat}
+            for row, seat in obj.occupied_seats.taken()
+        ]
+
+
+class FlightSeatMapSerializer(serializers.ModelSerializer):
+    rows = serializers.IntegerField(source="airplane.rows", read_only=True)
+    seats_in_row = serializers.IntegerField(
+        source="airplane.seats_in_row", read_only=True
+    )
+    encoding = serializers.SerializerMethodField()
+    taken = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Flight
+        fields = ("id", "rows", "seats_in_row", "encoding", "taken")
+
+    def get_encoding(self, obj) -> str:
+        return self.context.get("encoding", "base64")
+
+    @extend_schema_field(
+        {
+            "oneOf": [
+                {"type": "string", "format": "byte"},
+                {"type": "array", "items": {"type": "integer"}},
+            ]
+        }
+    )
+    def get_taken(self, obj):
+        return obj.occupied_seats.encode(self.get_encoding(obj))
+
+
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.CharField()
+    destination = serializers.CharField()
+    departure_date = serializers.DateField()
+    max_stops = serializers.IntegerField(min_value=0, max_value=2, default=2)
+    min_connection = serializers.IntegerField(
+        min_value=0,
+        default=45,
+        help_text="Minimum connection time, minutes"
+    )
+    max_connection = serializers.IntegerField(
+        min_value=1,
+        max_value=48 * 60,
+        default=24 * 60,
+        help_text="Maximum connection time, minutes"
+    )
+    seats = serializers.IntegerField(min_value=1, default=1)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
+
+    def validate(self, attrs):
+        if attrs["min_connection"] > attrs["max_connection"]:
+            raise serializers.ValidationError(
+                "min_connection must not exceed max_connection !"
+            )
+        return attrs
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField(read_only=True)
+    arrival_time = serializers.DateTimeField(read_only=True)
+    duration = serializers.IntegerField(
+        read_only=True,
+        help_text="Total travel time, minutes"
+    )
+    stops = serializers.IntegerField(read_only=True)
+    flights = FlightListSerializer(many=True, read_only=True)
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    seats = SeatSerializer(many=True, allow_empty=False)
+
+    class Meta:
+        model = SeatHold
+        fields = ("id", "flight", "seats", "created_at", "expires_at")
+        read_only_fields = ("flight", "expires_at")
+
+    def validate_seats(self, seats):
+        airplane = self.context["flight"].airplane
+        for seat in seats:
+            Ticket.validate_ticket(
+                seat["row"], seat["seat"], airplane, ValidationError
+            )
+        if len({(seat["row"], seat["seat"]) for seat in seats}) < len(seats):
+            raise ValidationError("Seats must be unique !")
+        return seats
+
+    def create(self, validated_data):
+        return hold_seats(
+            validated_data["flight"],
+            validated_data["user"],
+            [(seat["row"], seat["seat"]) for seat in validated_data["seats"]]
+        )
+
+
+class AutoSeatsSerializer(serializers.Serializer):
+    flight = serializers.PrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+    count = serializers.IntegerField(min_value=1)
+    adjacent = serializers.BooleanField(
+        default=False, help_text="Seats side by side in one row"
+    )
+
+    def validate(self, attrs):
+        airplane = attrs["flight"].airplane
+        if attrs["adjacent"]:
+            limit = airplane.seats_in_row
+        else:
+            limit = airplane.capacity
+        if attrs["count"] > limit:
+            raise ValidationError({
+                "count": f"Ensure this value is less than or equal to {limit}."
+            })
+        return attrs
+
 
 class OrderSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = TicketSerializer(
+        many=True, read_only=False, allow_empty=False, required=False
+    )
+    hold = serializers.PrimaryKeyRelatedField(
+        queryset=SeatHold.objects.select_related("flight__airplane"),
+        write_only=True,
+        required=False,
+        help_text="Seat hold to convert into tickets instead of tickets"
+    )
+    auto_seats = AutoSeatsSerializer(
+        write_only=True,
+        required=False,
+        help_text="Number of seats to be picked by the server "
+                  "instead of tickets"
+    )
 
     class Meta:
         model = Order
-        fields = ("id", "tickets", "created_at")
+        fields = ("id", "tickets", "hold", "auto_seats", "created_at")
+
+    def validate(self, attrs):
+        sources = [
+            name for name in ("tickets", "hold", "auto_seats")
+            if attrs.get(name)
+        ]
+        if not sources:
+            raise ValidationError({"tickets": "This field is required."})
+        if len(sources) > 1:
+            raise ValidationError(
+                "Provide only one of tickets, hold or auto_seats !"
+            )
+        hold = attrs.get("hold")
+        if hold is None:
+            return attrs
+
+        request = self.context.get("request")
+        if request is None or hold.user_id != request.user.id:
+            raise ValidationError({"hold": "Seat hold does not exist."})
+        if hold.expires_at <= timezone.now():
+            raise ValidationError({"hold": "Seat hold has expired."})
+        attrs["tickets"] = [
+            {"flight": hold.flight, "row": row, "seat": seat}
+            for row, seat in hold.seat_list
+        ]
+        return attrs
+
+    def validate_tickets(self, tickets):
+        seats = set()
+        errors = []
+        for ticket in tickets:
+            seat = (ticket["flight"].id, ticket["row"], ticket["seat"])
+            if seat in seats:
+                errors.append({
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        UniqueTogetherValidator.message.format(
+                            field_names="flight, row, seat"
+                        )
+                    ]
+                })
+            else:
+                errors.append({})
+            seats.add(seat)
+        if any(errors):
+            raise ValidationError(errors)
+        return tickets
 
     def create(self, validated_data):
         with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
+            hold = validated_data.pop("hold", None)
+            auto_seats = validated_data.pop("auto_seats", None)
+            if auto_seats:
+                tickets_data = assign_seats(**auto_seats)
+            else:
+                tickets_data = validated_data.pop("tickets")
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+            book_tickets(order, tickets_data, hold)
             return order
 
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class OrderNormalizedSerializer(OrderSerializer):
+    # Flights are listed once in the "included" section of the response
+    tickets = TicketSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = ("id", "tickets", "created_at")
+
+
+class ReferenceBundleSerializer(serializers.Serializer):
+    version = serializers.CharField()
+    countries = CountrySerializer(many=True)
+    cities = CityListSerializer(many=True)
+    airports = AirportListSerializer(many=True)
+    airplane_types = AirplaneTypeSerializer(many=True)
+    routes = RouteListSerializer(many=True)
@@ -0,0 +1,155 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save
+)
+from django.db.models import Q
+from django.dispatch import receiver
+from rest_framework.exceptions import ValidationError
+
+from airport.cache import bump_versions
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    City,
+    Country,
+    Crew,
+    Flight,
+    Route,
+    Ticket
+)
+from airport.search import index_airports
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_seat(sender, instance, raw, **kwargs):
+    """Keep seat of edited ticket to release it after save"""
+    if raw or instance.pk is None:
+        return
+    instance._previous_seat = (
+        Ticket.objects.filter(pk=instance.pk)
+        .values_list("flight_id", "row", "seat")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def take_ticket_seat(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_previous_seat", None)
+    if previous:
+        flight_id, row, seat = previous
+        Flight.update_seat_map(flight_id, release=[(row, seat)])
+    Flight.update_seat_map(
+        instance.flight_id,
+        take=[(instance.row, instance.seat)]
+    )
+
+
+@receiver(post_delete, sender=Ticket)
+def release_ticket_seat(sender, instance, **kwargs):
+    Flight.update_seat_map(
+        instance.flight_id,
+        release=[(instance.row, instance.seat)]
+    )
+
+
+def check_tickets_fit(tickets, rows: int, seats_in_row: int) -> None:
+    """Refuse seat layouts leaving sold tickets outside the airplane"""
+    if tickets.filter(Q(row__gt=rows) | Q(seat__gt=seats_in_row)).exists():
+        raise ValidationError(
+            f"Sold tickets do not fit into {rows} rows "
+            f"of {seats_in_row} seats"
+        )
+
+
+def rebuild_flight_maps(flights) -> None:
+    """Lay out seat maps of flights again for their airplane"""
+    for flight in flights.select_related("airplane"):
+        flight.rebuild_seat_map()
+        flight.rebuild_held_map()
+
+
+@receiver(pre_save, sender=Airplane)
+def remember_airplane_layout(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._previous_layout = (
+        Airplane.objects.filter(pk=instance.pk)
+        .values_list("rows", "seats_in_row")
+        .first()
+    )
+    if instance._previous_layout not in (
+        None, (instance.rows, instance.seats_in_row)
+    ):
+        check_tickets_fit(
+            Ticket.objects.filter(flight__airplane=instance),
+            instance.rows,
+            instance.seats_in_row
+        )
+
+
+@receiver(post_save, sender=Airplane)
+def rebuild_airplane_seat_maps(sender, instance, raw, **kwargs):
+    previous = getattr(instance, "_previous_layout", None)
+    if raw or previous in (None, (instance.rows, instance.seats_in_row)):
+        return
+    rebuild_flight_maps(instance.flights.all())
+
+
+@receiver(pre_save, sender=Flight)
+def remember_flight_airplane(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._previous_airplane_id = (
+        Flight.objects.filter(pk=instance.pk)
+        .values_list("airplane_id", flat=True)
+        .first()
+    )
+    if instance._previous_airplane_id not in (None, instance.airplane_id):
+        check_tickets_fit(
+            instance.tickets.all(),
+            instance.airplane.rows,
+            instance.airplane.seats_in_row
+        )
+
+
+@receiver(post_save, sender=Flight)
+def rebuild_flight_seat_maps(sender, instance, raw, **kwargs):
+    previous = getattr(instance, "_previous_airplane_id", None)
+    if raw or previous in (None, instance.airplane_id):
+        return
+    rebuild_flight_maps(Flight.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Airport)
+def index_airport(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    index_airports([instance])
+
+
+@receiver(post_save, sender=City)
+def index_city_airports(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    index_airports(instance.airports.select_related("closest_big_city"))
+
+
+def bump_model_version(sender, **kwargs):
+    bump_versions(sender._meta.model_name)
+
+
+for model in (
+    Country, City, Airport, Route, Crew, AirplaneType, Airplane, Flight, Ticket
+):
+    post_save.connect(bump_model_version, sender=model)
+    post_delete.connect(bump_model_version, sender=model)
+
+
+@receiver(m2m_changed, sender=Flight.crew.through)
+def bump_flight_crew_version(sender, **kwargs):
+    bump_versions("flight")
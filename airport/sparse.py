@@ -0,0 +1,93 @@
+from rest_framework.exceptions import ValidationError
+
+SPARSE_ACTIONS = ("list", "retrieve")
+
+
+def serializer_field_names(serializer_class) -> list[str]:
+    fields = getattr(getattr(serializer_class, "Meta", None), "fields", None)
+    if isinstance(fields, (list, tuple)):
+        return list(fields)
+    return list(serializer_class().fields)
+
+
+class SparseFieldsMixin:
+    # ?fields=a,b keeps only listed fields of list/retrieve responses,
+    # ?omit=c drops fields. The queryset only gets the select_related,
+    # prefetch_related and annotations (FlightQuerySet-like methods) of
+    # the rendered fields, as declared in sparse_fields_relations:
+    # {"field": {"select_related": (...), "prefetch_related": (...),
+    #            "annotations": ("queryset_method", ...)}}
+
+    sparse_fields_relations = {}
+
+    def get_sparse_fields(self):
+        """Names of requested serializer fields, None for all of them"""
+        if self.action not in SPARSE_ACTIONS:
+            return None
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self._parse_sparse_fields()
+        return self._sparse_fields
+
+    def _parse_sparse_fields(self):
+        params = self.request.query_params
+        if "fields" not in params and "omit" not in params:
+            return None
+
+        available = serializer_field_names(self.get_serializer_class())
+        errors = {}
+        selected = set(available)
+        for param in ("fields", "omit"):
+            if param not in params:
+                continue
+            names = {
+                name.strip()
+                for name in params[param].split(",") if name.strip()
+            }
+            unknown = names - set(available)
+            if unknown:
+                errors[param] = (
+                    f"Unknown fields: {', '.join(sorted(unknown))}. "
+                    f"Available: {', '.join(available)}"
+                )
+            if param == "fields":
+                selected &= names
+            else:
+                selected -= names
+        if errors:
+            raise ValidationError(errors)
+        return [name for name in available if name in selected]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in SPARSE_ACTIONS:
+            return queryset
+
+        fields = self.get_sparse_fields()
+        if fields is None:
+            fields = serializer_field_names(self.get_serializer_class())
+        select_related, prefetch_related, annotations = set(), set(), []
+        for name in fields:
+            relations = self.sparse_fields_relations.get(name, {})
+            select_related.update(relations.get("select_related", ()))
+            prefetch_related.update(relations.get("prefetch_related", ()))
+            for annotation in relations.get("annotations", ()):
+                if annotation not in annotations:
+                    annotations.append(annotation)
+
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(prefetch_related))
+        for annotation in annotations:
+            queryset = getattr(queryset, annotation)()
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, "child", serializer)
+            for name in list(target.fields):
+                if name not in fields:
+                    target.fields.pop(name)
+        return serializer
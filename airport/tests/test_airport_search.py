@@ -0,0 +1,50 @@
+from django.test import TestCase
+
+from airport.models import Airport
+from airport.search import search_airports, trigrams
+from airport.tests.init_sample import (
+    init_sample_airport,
+    init_sample_city,
+)
+
+
+class AirportSearchTests(TestCase):
+    def setUp(self):
+        self.york = init_sample_city(name="New York")
+        self.jfk = init_sample_airport(
+            name="John F. Kennedy", closest_big_city=self.york
+        )
+        self.heathrow = init_sample_airport(
+            name="Heathrow",
+            closest_big_city=init_sample_city(name="London"),
+        )
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams("Lviv"), {"lvi", "viv"})
+        self.assertEqual(trigrams("Lv"), set())
+
+    def test_search_matches_icontains(self):
+        for text in ("york", "KENN", "row", "on", "x", "hrow l"):
+            self.assertEqual(
+                set(search_airports(text)),
+                set(
+                    Airport.objects.filter(name__icontains=text)
+                    | Airport.objects.filter(
+                        closest_big_city__name__icontains=text
+                    )
+                ),
+                text
+            )
+
+    def test_search_without_city(self):
+        self.assertEqual(list(search_airports("york", with_city=False)), [])
+        self.assertEqual(
+            list(search_airports("kennedy", with_city=False)), [self.jfk]
+        )
+
+    def test_city_rename_reindexes_airports(self):
+        self.york.name = "Big Apple"
+        self.york.save()
+
+        self.assertEqual(list(search_airports("york")), [])
+        self.assertEqual(list(search_airports("apple")), [self.jfk])
@@ -0,0 +1,103 @@
+from django.core.cache import cache
+from django.db.models import F
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Country, ModelVersion
+from airport.tests.init_sample import (
+    init_sample_user,
+    init_sample_city,
+    init_sample_country
+)
+
+COUNTRY_URL = reverse("airport:country-list")
+CITY_URL = reverse("airport:city-list")
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = init_sample_user()
+        self.client.force_authenticate(self.user)
+        self.country = init_sample_country()
+
+    def test_validators_headers(self):
+        res = self.client.get(COUNTRY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", res)
+        self.assertIn("Accept", res["Vary"])
+
+    def test_not_modified_without_list_query(self):
+        etag = self.client.get(COUNTRY_URL)["ETag"]
+
+        # Only the country version
+        with self.assertNumQueries(1):
+            res = self.client.get(COUNTRY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+    def test_not_modified_since(self):
+        last_modified = self.client.get(COUNTRY_URL)["Last-Modified"]
+
+        res = self.client.get(COUNTRY_URL, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_modified_after_save(self):
+        etag = self.client.get(COUNTRY_URL)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Country.objects.create(name="Other country")
+
+        res = self.client.get(COUNTRY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(len(res.data), 2)
+
+    def test_related_model_changes_etag(self):
+        city = init_sample_city()
+        etag = self.client.get(CITY_URL)["ETag"]
+        city.country.name = "Renamed country"
+        with self.captureOnCommitCallbacks(execute=True):
+            city.country.save()
+
+        res = self.client.get(CITY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_version_shared_by_workers(self):
+        etag = self.client.get(COUNTRY_URL)["ETag"]
+        # Cache of this worker is empty, another one saved a country
+        cache.clear()
+        ModelVersion.objects.filter(name="country").update(
+            version=F("version") + 1
+        )
+
+        res = self.client.get(COUNTRY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_url(self):
+        etag = self.client.get(COUNTRY_URL)["ETag"]
+        detail_url = reverse("airport:country-detail", args=[self.country.id])
+
+        res = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        res = self.client.get(detail_url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_old_if_modified_since(self):
+        res = self.client.get(
+            COUNTRY_URL, HTTP_IF_MODIFIED_SINCE=http_date(0)
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
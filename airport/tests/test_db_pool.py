@@ -0,0 +1,148 @@
+import threading
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.utils import load_backend
+from django.test import SimpleTestCase, TestCase
+
+from airport_service.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.alive = True
+
+    def close(self):
+        self.closed = 1
+
+
+def check(connection):
+    if not connection.alive:
+        raise ConnectionError("server closed the connection")
+
+
+class Clock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.connected = []
+        self.pool = ConnectionPool(self.connect, size=2, timeout=0.05)
+
+    def connect(self):
+        connection = FakeConnection()
+        self.connected.append(connection)
+        return connection
+
+    def test_connection_reused(self):
+        first = self.pool.get()
+        self.pool.put(first)
+        second = self.pool.get()
+
+        self.assertIs(second, first)
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics["connects"], 1)
+        self.assertEqual(metrics["reuses"], 1)
+        self.assertEqual(metrics["in_use"], 1)
+
+    def test_discarded_and_closed_connections_replaced(self):
+        first = self.pool.get()
+        self.pool.put(first, discard=True)
+        second = self.pool.get()
+        self.pool.put(second)
+        second.closed = 1
+        third = self.pool.get()
+
+        self.assertTrue(first.closed)
+        self.assertEqual(len({id(first), id(second), id(third)}), 3)
+        self.assertEqual(self.pool.metrics()["idle"], 0)
+
+    def test_long_idle_connection_checked(self):
+        self.pool.check = check
+        self.pool.check_after = 30
+        self.pool.timer = Clock()
+        first = self.pool.get()
+        self.pool.put(first)
+        # Recently returned, not checked
+        first.alive = False
+        self.assertIs(self.pool.get(), first)
+        self.pool.put(first)
+
+        self.pool.timer.now += 30
+        second = self.pool.get()
+        self.pool.put(second)
+        self.pool.timer.now += 30
+        third = self.pool.get()
+
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+        self.assertIs(third, second)
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics["checks"], 2)
+        self.assertEqual(metrics["broken"], 1)
+
+    def test_no_check_without_health_checks(self):
+        self.pool.timer = Clock()
+        first = self.pool.get()
+        self.pool.put(first)
+        self.pool.timer.now += 3600
+
+        self.assertIs(self.pool.get(), first)
+        self.assertEqual(self.pool.metrics()["checks"], 0)
+
+    def test_timeout_when_exhausted(self):
+        self.pool.get()
+        self.pool.get()
+
+        with self.assertRaises(PoolTimeout):
+            self.pool.get()
+
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics["waits"], 1)
+        self.assertEqual(metrics["timeouts"], 1)
+        self.assertGreaterEqual(metrics["wait_seconds"], 0.05)
+        self.assertEqual(len(self.connected), 2)
+
+    def test_wait_for_returned_connection(self):
+        self.pool.timeout = 5
+        held = [self.pool.get(), self.pool.get()]
+        timer = threading.Timer(0.05, self.pool.put, args=[held[0]])
+        timer.start()
+
+        connection = self.pool.get()
+        timer.join()
+
+        self.assertIs(connection, held[0])
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics["waits"], 1)
+        self.assertEqual(metrics["timeouts"], 0)
+        self.assertGreater(metrics["wait_seconds_max"], 0)
+
+    def test_close_idle(self):
+        connection = self.pool.get()
+        self.pool.put(connection)
+        self.pool.close()
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(self.pool.metrics()["idle"], 0)
+
+    def test_backend_loads(self):
+        backend = load_backend("airport_service.db.postgresql_pool")
+
+        self.assertEqual(backend.DatabaseWrapper.vendor, "postgresql")
+
+
+class BenchmarkDbConnectionsTests(TestCase):
+    def test_modes_reported(self):
+        out = StringIO()
+
+        call_command("benchmark_db_connections", requests=3, stdout=out)
+
+        self.assertIn("per-request:", out.getvalue())
+        self.assertIn("persistent:", out.getvalue())
@@ -1,4 +1,8 @@
 from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from unittest.mock import patch
 
 from django.test import TestCase
 from django.urls import reverse
@@ -7,13 +11,15 @@ from rest_framework.test import APIClient
 
 from airport.models import Flight
 from airport.serializers import FlightSerializer, FlightListSerializer, FlightDetailSerializer
+from airport.views import FlightPagination
 from airport.tests.init_sample import (
     init_sample_user,
     init_sample_superuser,
     init_sample_crew,
     init_sample_flight,
     init_sample_route,
-    init_sample_airplane, init_sample_airport
+    init_sample_airplane, init_sample_airport,
+    init_sample_order
 )
 
 FLIGHT_URL = reverse("airport:flight-list")
@@ -44,12 +50,73 @@ class AuthenticatedFlightApiTests(TestCase):
         init_sample_flight()
         res = self.client.get(FLIGHT_URL)
 
-        flights = Flight.objects.order_by("departure_time")
+        flights = Flight.objects.order_by("-departure_time")
         serializer = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         for key, value in serializer.data[0].items():
-            self.assertEqual(res.data[0][key], value)
+            self.assertEqual(res.data["results"][0][key], value)
+
+    def test_list_flights_cursor_pagination(self):
+        departure_time = datetime(2024, 5, 1, 10, 0)
+        for hours in range(5):
+            init_sample_flight(
+                departure_time=departure_time + timedelta(hours=hours),
+                arrival_time=departure_time + timedelta(days=1),
+            )
+        expected = list(
+            Flight.objects.order_by("-departure_time", "-id")
+            .values_list("id", flat=True)
+        )
+
+        res = self.client.get(FLIGHT_URL, {"page_size": 2})
+        self.assertNotIn("count", res.data)
+        ids = [flight["id"] for flight in res.data["results"]]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            ids += [flight["id"] for flight in res.data["results"]]
+
+        self.assertEqual(ids, expected)
+
+    def test_list_flights_page_size_ceiling(self):
+        departure_time = datetime(2024, 5, 1, 10, 0)
+        for hours in range(5):
+            init_sample_flight(
+                departure_time=departure_time + timedelta(hours=hours),
+                arrival_time=departure_time + timedelta(days=1),
+            )
+
+        with patch.object(FlightPagination, "max_page_size", 3):
+            res = self.client.get(FLIGHT_URL, {"page_size": 50})
+
+        self.assertEqual(len(res.data["results"]), 3)
+
+    def test_list_flights_tickets_available(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 98)
+        flight.refresh_from_db()
+        self.assertEqual(flight.tickets_sold, 2)
+
+        order.tickets.first().delete()
+        flight.refresh_from_db()
+        self.assertEqual(flight.tickets_sold, 1)
+
+    def test_reconcile_flight_seats_command(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        Flight.objects.filter(id=flight.id).update(
+            tickets_sold=0, seat_map=b""
+        )
+
+        call_command("reconcile_flight_seats", stdout=StringIO())
+
+        flight.refresh_from_db()
+        self.assertEqual(flight.tickets_sold, 2)
+        self.assertEqual(list(flight.seats.taken()), [(1, 1), (2, 2)])
 
     def test_filter_flights_by_source(self):
         route1 = init_sample_route(
@@ -72,13 +139,13 @@ class AuthenticatedFlightApiTests(TestCase):
         flights = (
             Flight.objects.
             filter(route__source__name__icontains="aport1").
-            order_by("departure_time")
+            order_by("-departure_time")
         )
         serializer1 = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         for key, value in serializer1.data[0].items():
-            self.assertEqual(res.data[0][key], value)
+            self.assertEqual(res.data["results"][0][key], value)
 
     def test_filter_flights_by_destination(self):
         route1 = init_sample_route(
@@ -101,13 +168,13 @@ class AuthenticatedFlightApiTests(TestCase):
         flights = (
             Flight.objects.
             filter(route__destination__name__icontains="aport2").
-            order_by("departure_time")
+            order_by("-departure_time")
         )
         serializer1 = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         for key, value in serializer1.data[0].items():
-            self.assertEqual(res.data[0][key], value)
+            self.assertEqual(res.data["results"][0][key], value)
 
     def test_filter_flights_by_departure_date_after(self):
         departure_date_after = datetime.now()
@@ -122,13 +189,13 @@ class AuthenticatedFlightApiTests(TestCase):
         flights = (
             Flight.objects.
             filter(departure_time__date__gte=departure_date_after.date()).
-            order_by("departure_time")
+            order_by("-departure_time")
         )
         serializer1 = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         for key, value in serializer1.data[0].items():
-            self.assertEqual(res.data[0][key], value)
+            self.assertEqual(res.data["results"][0][key], value)
 
     def test_filter_flights_by_departure_date_before(self):
         departure_date_before = datetime.now() + timedelta(days=2)
@@ -143,13 +210,13 @@ class AuthenticatedFlightApiTests(TestCase):
         flights = (
             Flight.objects.
             filter(departure_time__date__gte=departure_date_before.date()).
-            order_by("departure_time")
+            order_by("-departure_time")
         )
         serializer1 = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         for key, value in serializer1.data[0].items():
-            self.assertEqual(res.data[0][key], value)
+            self.assertEqual(res.data["results"][0][key], value)
 
     def test_filter_flights_by_arrival_date_after(self):
         arrival_date_after = datetime.now() + timedelta(days=3)
@@ -164,13 +231,13 @@ class AuthenticatedFlightApiTests(TestCase):
         flights = (
             Flight.objects.
             filter(arrival_time__date__gte=arrival_date_after.date()).
-            order_by("departure_time")
+            order_by("-departure_time")
         )
         serializer1 = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         for key, value in serializer1.data[0].items():
-            self.assertEqual(res.data[0][key], value)
+            self.assertEqual(res.data["results"][0][key], value)
 
     def test_filter_flights_by_arrival_date_before(self):
         arrival_date_before = datetime.now() + timedelta(days=2)
@@ -185,13 +252,13 @@ class AuthenticatedFlightApiTests(TestCase):
         flights = (
             Flight.objects.
             filter(arrival_time__date__gte=arrival_date_before.date()).
-            order_by("departure_time")
+            order_by("-departure_time")
         )
         serializer1 = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         for key, value in serializer1.data[0].items():
-            self.assertEqual(res.data[0][key], value)
+            self.assertEqual(res.data["results"][0][key], value)
 
     def test_retrieve_flight_detail(self):
         init_sample_flight()
@@ -228,12 +295,12 @@ class AdminFlightApiTests(TestCase):
         init_sample_flight()
         res = self.client.get(FLIGHT_URL)
 
-        flights = Flight.objects.order_by("departure_time")
+        flights = Flight.objects.order_by("-departure_time")
         serializer = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         for key, value in serializer.data[0].items():
-            self.assertEqual(res.data[0][key], value)
+            self.assertEqual(res.data["results"][0][key], value)
 
     def test_retrieve_flight_detail(self):
         init_sample_flight()
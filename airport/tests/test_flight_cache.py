@@ -0,0 +1,86 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Ticket
+from airport.tests.init_sample import (
+    init_sample_user,
+    init_sample_flight,
+    init_sample_order
+)
+from airport_service.metrics import CACHE_LOOKUPS
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class FlightListCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        CACHE_LOOKUPS.clear()
+        self.client = APIClient()
+        self.user = init_sample_user()
+        self.client.force_authenticate(self.user)
+        self.flight = init_sample_flight()
+
+    def test_repeated_list_is_cached(self):
+        res1 = self.client.get(FLIGHT_URL, {"source": "Sample"})
+        # Only the versions of listed models
+        with self.assertNumQueries(1):
+            res2 = self.client.get(FLIGHT_URL, {"source": " sample "})
+
+        self.assertEqual(res1["X-Cache"], "MISS")
+        self.assertEqual(res2["X-Cache"], "HIT")
+        self.assertEqual(res1.data, res2.data)
+        self.assertEqual(CACHE_LOOKUPS.value("flight_list", "hit"), 1)
+        self.assertEqual(CACHE_LOOKUPS.value("flight_list", "miss"), 1)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_lookups_exported_in_metrics(self):
+        self.client.get(FLIGHT_URL)
+        self.client.get(FLIGHT_URL)
+
+        text = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        ).content.decode()
+
+        for result in ("hit", "miss"):
+            self.assertIn(
+                "airport_cache_lookups_total"
+                f'{{cache="flight_list",result="{result}"}} 1',
+                text,
+            )
+
+    def test_other_filters_not_shared(self):
+        self.client.get(FLIGHT_URL, {"source": "sample"})
+        res = self.client.get(FLIGHT_URL, {"source": "other"})
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"], [])
+
+    def test_ticket_write_invalidates(self):
+        self.client.get(FLIGHT_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            order = init_sample_order(user=self.user)
+
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["tickets_available"], 98)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.filter(order=order).first().delete()
+        res = self.client.get(FLIGHT_URL)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 99)
+
+    def test_unauthenticated_not_served_from_cache(self):
+        self.client.get(FLIGHT_URL)
+        res = APIClient().get(FLIGHT_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(FLIGHT_LIST_CACHE_TTL=0)
+    def test_cache_disabled(self):
+        self.client.get(FLIGHT_URL)
+        res = self.client.get(FLIGHT_URL)
+        self.assertEqual(res["X-Cache"], "MISS")
@@ -0,0 +1,151 @@
+import base64
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from rest_framework.exceptions import ValidationError
+
+from airport.models import Flight, Ticket
+from airport.seatmap import SeatMap
+from airport.tests.init_sample import (
+    init_sample_airplane,
+    init_sample_user,
+    init_sample_flight,
+    init_sample_order
+)
+
+FLIGHT_SEATMAP = "airport:flight-seatmap"
+FLIGHT_DETAIL = "airport:flight-detail"
+
+
+def seatmap_url(instance_id):
+    return reverse(FLIGHT_SEATMAP, args=[instance_id])
+
+
+class SeatMapTests(TestCase):
+    def test_take_and_release_seats(self):
+        seat_map = SeatMap(3, 4)
+        self.assertTrue(seat_map.take(1, 1))
+        self.assertTrue(seat_map.take(3, 4))
+        self.assertFalse(seat_map.take(3, 4))
+
+        self.assertEqual(list(seat_map.taken()), [(1, 1), (3, 4)])
+        self.assertEqual(seat_map.count(), 2)
+        self.assertEqual(seat_map.to_rle(), [0, 1, 10, 1])
+
+        self.assertTrue(seat_map.release(1, 1))
+        self.assertFalse(seat_map.is_taken(1, 1))
+        self.assertEqual(seat_map.to_rle(), [11, 1])
+
+    def test_seat_out_of_range(self):
+        seat_map = SeatMap(3, 4)
+        with self.assertRaises(ValueError):
+            seat_map.take(4, 1)
+
+
+class UnauthenticatedSeatMapApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_seatmap_auth_required(self):
+        flight = init_sample_flight()
+        res = self.client.get(seatmap_url(flight.id))
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedSeatMapApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = init_sample_user()
+        self.client.force_authenticate(self.user)
+
+    def test_seatmap_follows_tickets(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+
+        res = self.client.get(seatmap_url(flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["rows"], 10)
+        self.assertEqual(res.data["seats_in_row"], 10)
+        self.assertEqual(res.data["encoding"], "base64")
+        seat_map = SeatMap(10, 10, base64.b64decode(res.data["taken"]))
+        self.assertEqual(list(seat_map.taken()), [(1, 1), (2, 2)])
+
+    def test_seatmap_rle_encoding(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+
+        res = self.client.get(seatmap_url(flight.id), {"encoding": "rle"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken"], [0, 1, 10, 1, 88])
+
+    def test_seatmap_invalid_encoding(self):
+        flight = init_sample_flight()
+        res = self.client.get(seatmap_url(flight.id), {"encoding": "hex"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_seatmap_released_on_ticket_delete(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        Ticket.objects.get(flight=flight, row=1, seat=1).delete()
+
+        res = self.client.get(seatmap_url(flight.id), {"encoding": "rle"})
+
+        self.assertEqual(res.data["taken"], [11, 1, 88])
+
+    def test_detail_taken_places_from_seatmap(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+
+        res = self.client.get(reverse(FLIGHT_DETAIL, args=[flight.id]))
+
+        self.assertEqual(
+            res.data["taken_places"],
+            [{"row": 1, "seat": 1}, {"row": 2, "seat": 2}]
+        )
+
+    def test_seatmap_follows_airplane_layout(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        airplane = flight.airplane
+        airplane.seats_in_row = 12
+        airplane.save()
+
+        res = self.client.get(seatmap_url(flight.id))
+
+        self.assertEqual(res.data["seats_in_row"], 12)
+        seat_map = SeatMap(10, 12, base64.b64decode(res.data["taken"]))
+        self.assertEqual(list(seat_map.taken()), [(1, 1), (2, 2)])
+        flight = Flight.objects.with_tickets_available().get(pk=flight.pk)
+        self.assertEqual(flight.tickets_available, 118)
+
+    def test_seatmap_follows_flight_airplane(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        flight.airplane = init_sample_airplane(
+            name="Other airplane", rows=4, seats_in_row=3
+        )
+        flight.save()
+
+        res = self.client.get(seatmap_url(flight.id), {"encoding": "rle"})
+
+        self.assertEqual(res.data["taken"], [0, 1, 3, 1, 7])
+
+    def test_layout_must_fit_sold_tickets(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        airplane = flight.airplane
+        airplane.rows = 1
+
+        with self.assertRaises(ValidationError):
+            airplane.save()
+
+        flight.airplane = init_sample_airplane(
+            name="Small airplane", rows=1, seats_in_row=1
+        )
+        with self.assertRaises(ValidationError):
+            flight.save()
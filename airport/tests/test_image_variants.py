@@ -0,0 +1,112 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from PIL import Image
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.images import variant_names
+from airport.tests.init_sample import (
+    init_sample_superuser,
+    init_sample_crew,
+    init_sample_flight
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+def upload(client, url, field):
+    with tempfile.NamedTemporaryFile(suffix=".png") as ntf:
+        Image.new("RGBA", (1000, 500), (10, 20, 30, 255)).save(ntf, "PNG")
+        ntf.seek(0)
+        return client.post(url, {field: ntf}, format="multipart")
+
+
+@override_settings(IMAGE_VARIANT_WORKERS=0, FLIGHT_LIST_CACHE_TTL=0)
+class ImageVariantsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = init_sample_superuser()
+        self.client.force_authenticate(self.user)
+        self.crew = init_sample_crew()
+        self.flight = init_sample_flight()
+        self.airplane = self.flight.airplane
+
+    def tearDown(self):
+        for photo in (self.crew.photo, self.airplane.airplane_photo):
+            if photo:
+                for names in variant_names(photo.name).values():
+                    for name in names.values():
+                        default_storage.delete(name)
+                photo.delete()
+
+    def test_crew_photo_variants(self):
+        url = reverse("airport:crew-upload", args=[self.crew.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            res = upload(self.client, url, "photo")
+        self.crew.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        variants = variant_names(self.crew.photo.name)
+        for variant, size in (("thumb", (160, 80)), ("medium", (640, 320))):
+            for extension, image_format in (
+                ("webp", "WEBP"), ("jpeg", "JPEG")
+            ):
+                path = default_storage.path(variants[variant][extension])
+                self.assertTrue(os.path.exists(path))
+                with Image.open(path) as image:
+                    self.assertEqual(image.size, size)
+                    self.assertEqual(image.format, image_format)
+        self.assertTrue(
+            res.data["photo_variants"]["thumb"]["webp"].endswith(
+                variants["thumb"]["webp"]
+            )
+        )
+
+    def test_airplane_image_variants_in_flight_list(self):
+        url = reverse("airport:airplane-upload", args=[self.airplane.id])
+        upload(self.client, url, "airplane_photo")
+        self.airplane.refresh_from_db()
+
+        res = self.client.get(FLIGHT_URL)
+
+        variants = res.data["results"][0]["airplane_image_variants"]
+        self.assertEqual(set(variants), {"thumb", "medium"})
+        self.assertTrue(
+            variants["medium"]["jpeg"].startswith("http://testserver/media/")
+        )
+
+    def test_variants_scheduled_only_for_new_photo(self):
+        url = reverse("airport:crew-upload", args=[self.crew.id])
+        with mock.patch("airport.views.schedule_variants") as schedule:
+            upload(self.client, url, "photo")
+            self.crew.refresh_from_db()
+            self.client.get(url)
+            self.client.post(url, {}, format="multipart")
+
+        schedule.assert_called_once_with(self.crew.photo.name)
+
+    def test_no_photo_no_variants(self):
+        res = self.client.get(
+            reverse("airport:crew-detail", args=[self.crew.id])
+        )
+        self.assertIsNone(res.data["photo_variants"])
+
+    @override_settings(IMAGE_VARIANT_WORKERS=1)
+    def test_generate_variants_command_in_process_pool(self):
+        url = reverse("airport:crew-upload", args=[self.crew.id])
+        upload(self.client, url, "photo")
+        self.crew.refresh_from_db()
+
+        out = StringIO()
+        call_command("generate_image_variants", stdout=out)
+
+        self.assertIn("Generated 4 variants of 1 photos", out.getvalue())
+        thumb = variant_names(self.crew.photo.name)["thumb"]["webp"]
+        self.assertTrue(default_storage.exists(thumb))
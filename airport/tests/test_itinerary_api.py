@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Flight
+from airport.tests.init_sample import (
+    init_sample_user,
+    init_sample_airport,
+    init_sample_city,
+    init_sample_flight,
+    init_sample_route
+)
+
+ITINERARY_URL = reverse("airport:itinerary-list")
+DEPARTURE = datetime(2024, 5, 10, 8, 0, tzinfo=timezone.utc)
+
+
+class UnauthenticatedItineraryApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_itinerary_auth_required(self):
+        res = self.client.get(ITINERARY_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedItineraryApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = init_sample_user()
+        self.client.force_authenticate(self.user)
+
+        self.lviv = init_sample_airport(name="Lviv Airport")
+        self.warsaw = init_sample_airport(name="Chopin Airport")
+        self.paris = init_sample_airport(
+            name="Charles de Gaulle",
+            closest_big_city=init_sample_city(name="Paris"),
+        )
+        self.direct = self._flight(self.lviv, self.paris, 0, 3)
+        self.first_leg = self._flight(self.lviv, self.warsaw, 1, 2)
+        self.second_leg = self._flight(self.warsaw, self.paris, 3, 5)
+        self.tight_leg = self._flight(self.warsaw, self.paris, 2, 4)
+
+    @staticmethod
+    def _flight(source, destination, departs_in, arrives_in):
+        return init_sample_flight(
+            route=init_sample_route(source=source, destination=destination),
+            departure_time=DEPARTURE + timedelta(hours=departs_in),
+            arrival_time=DEPARTURE + timedelta(hours=arrives_in),
+        )
+
+    def _search(self, **params):
+        defaults = {
+            "source": "lviv",
+            "destination": "paris",
+            "departure_date": DEPARTURE.date(),
+        }
+        defaults.update(params)
+        return self.client.get(ITINERARY_URL, defaults)
+
+    def test_direct_and_connecting_itineraries(self):
+        res = self._search()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                [flight["id"] for flight in itinerary["flights"]]
+                for itinerary in res.data
+            ],
+            [[self.direct.id], [self.first_leg.id, self.second_leg.id]]
+        )
+        self.assertEqual(res.data[1]["stops"], 1)
+        self.assertEqual(res.data[1]["duration"], 4 * 60)
+
+    def test_minimum_connection_time(self):
+        res = self._search(min_connection=0, max_stops=1)
+
+        self.assertEqual(len(res.data), 3)
+
+    def test_direct_only(self):
+        res = self._search(max_stops=0)
+
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]["flights"][0]["id"], self.direct.id)
+
+    def test_sold_out_flights_skipped(self):
+        Flight.objects.filter(id=self.direct.id).update(tickets_sold=100)
+
+        res = self._search()
+
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]["stops"], 1)
+
+    def test_other_date(self):
+        res = self._search(departure_date=DEPARTURE.date() + timedelta(1))
+        self.assertEqual(res.data, [])
+
+    def test_invalid_search(self):
+        res = self._search(max_stops=3)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
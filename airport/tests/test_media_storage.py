@@ -0,0 +1,144 @@
+import io
+import tempfile
+from io import StringIO
+
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.images import render_variants, variant_names
+from airport.tests.init_sample import init_sample_superuser, init_sample_crew
+
+
+def upload_photo(client, crew, color=(200, 10, 10)):
+    url = reverse("airport:crew-upload", args=[crew.id])
+    with tempfile.NamedTemporaryFile(suffix=".JPG") as ntf:
+        Image.new("RGB", (20, 20), color).save(ntf, format="JPEG")
+        ntf.seek(0)
+        res = client.post(url, {"photo": ntf}, format="multipart")
+    crew.refresh_from_db()
+    return res
+
+
+@override_settings(IMAGE_VARIANT_WORKERS=0)
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = init_sample_superuser()
+        self.client.force_authenticate(self.user)
+        self.crew1 = init_sample_crew()
+        self.crew2 = init_sample_crew(first_name="Second")
+
+    def test_identical_uploads_are_stored_once(self):
+        res = upload_photo(self.client, self.crew1)
+        upload_photo(self.client, self.crew2)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        name = self.crew1.photo.name
+        self.assertRegex(name, r"^blobs/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$")
+        self.assertEqual(self.crew2.photo.name, name)
+        self.assertTrue(res.data["photo"].endswith(name))
+        directory, file_name = name.rsplit("/", 1)
+        self.assertEqual(
+            default_storage.listdir(directory)[1].count(file_name), 1
+        )
+
+    def test_other_content_other_name(self):
+        upload_photo(self.client, self.crew1)
+        upload_photo(self.client, self.crew2, color=(10, 200, 10))
+
+        self.assertNotEqual(self.crew1.photo.name, self.crew2.photo.name)
+
+    def test_same_content_saved_twice_stored_once(self):
+        names = [
+            default_storage.save("upload/twice.txt", ContentFile(b"twice"))
+            for _ in range(2)
+        ]
+        variant = names[0].replace(".txt", ".thumb.txt")
+        names += [
+            default_storage.save(variant, ContentFile(b"twice variant"))
+            for _ in range(2)
+        ]
+
+        self.assertEqual(names, [names[0]] * 2 + [variant] * 2)
+        directory, file_name = names[0].rsplit("/", 1)
+        digest = file_name.split(".")[0]
+        self.assertEqual(
+            sorted(
+                stored
+                for stored in default_storage.listdir(directory)[1]
+                if stored.startswith(digest)
+            ),
+            sorted([file_name, variant.rsplit("/", 1)[1]]),
+        )
+
+    def test_variants_of_legacy_upload_kept_next_to_it(self):
+        name = "upload/crews/legacy-photo.jpg"
+        content = io.BytesIO()
+        Image.new("RGB", (20, 20), (10, 10, 200)).save(content, "JPEG")
+        # Stored under its upload path before content addressing
+        FileSystemStorage._save(
+            default_storage, name, ContentFile(content.getvalue())
+        )
+
+        saved = render_variants(name)
+
+        expected = [
+            target
+            for names in variant_names(name).values()
+            for target in names.values()
+        ]
+        self.assertEqual(saved, expected)
+        for target in expected:
+            self.assertTrue(default_storage.exists(target))
+            default_storage.delete(target)
+        default_storage.delete(name)
+
+    def test_blob_kept_on_delete(self):
+        upload_photo(self.client, self.crew1)
+        upload_photo(self.client, self.crew2)
+
+        self.crew1.photo.delete()
+
+        self.assertTrue(default_storage.exists(self.crew2.photo.name))
+
+    def test_variants_keep_derived_names(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            upload_photo(self.client, self.crew1)
+
+        thumb = variant_names(self.crew1.photo.name)["thumb"]["webp"]
+        self.assertTrue(default_storage.exists(thumb))
+
+    def test_collect_media_garbage(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            upload_photo(self.client, self.crew1)
+        orphan = default_storage.save(
+            "upload/orphan.txt", ContentFile(b"orphan blob")
+        )
+        kept = [self.crew1.photo.name] + [
+            name
+            for names in variant_names(self.crew1.photo.name).values()
+            for name in names.values()
+        ]
+
+        out = StringIO()
+        call_command("collect_media_garbage", "--dry-run", "--grace=0", stdout=out)
+        self.assertIn("Would remove", out.getvalue())
+        self.assertTrue(default_storage.exists(orphan))
+
+        call_command("collect_media_garbage", "--grace=0", stdout=StringIO())
+        self.assertFalse(default_storage.exists(orphan))
+        for name in kept:
+            self.assertTrue(default_storage.exists(name))
+
+    def test_collect_media_garbage_grace(self):
+        orphan = default_storage.save(
+            "upload/orphan.txt", ContentFile(b"fresh orphan blob")
+        )
+        call_command("collect_media_garbage", stdout=StringIO())
+        self.assertTrue(default_storage.exists(orphan))
@@ -0,0 +1,124 @@
+import os
+import shutil
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+CONTENT = b"0123456789abcdef"
+
+
+def media_url(name):
+    return reverse("media", kwargs={"path": name})
+
+
+def read(res):
+    return b"".join(res.streaming_content)
+
+
+class MediaViewTests(TestCase):
+    def setUp(self):
+        self.blob = default_storage.save("file.txt", ContentFile(CONTENT))
+        # Written around the storage, which would rename it to a blob
+        self.plain = "docs/plain.txt"
+        path = default_storage.path(self.plain)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(CONTENT)
+
+    def tearDown(self):
+        default_storage.purge(self.blob)
+        shutil.rmtree(default_storage.path("docs"), ignore_errors=True)
+
+    def test_blob_cached_as_immutable(self):
+        res = self.client.get(media_url(self.blob))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(read(res), CONTENT)
+        self.assertEqual(res["Content-Type"], "text/plain")
+        self.assertEqual(res["Accept-Ranges"], "bytes")
+        self.assertIn("immutable", res["Cache-Control"])
+        self.assertIn(self.blob.rsplit("/", 1)[-1], res["ETag"])
+
+    def test_plain_name_revalidated(self):
+        res = self.client.get(media_url(self.plain))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(read(res), CONTENT)
+        self.assertEqual(res["Cache-Control"], "public, no-cache")
+        self.assertIn("Last-Modified", res)
+
+    def test_if_none_match_not_modified(self):
+        for name in (self.blob, self.plain):
+            etag = self.client.get(media_url(name))["ETag"]
+
+            res = self.client.get(media_url(name), HTTP_IF_NONE_MATCH=etag)
+
+            self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(res["ETag"], etag)
+
+    def test_range(self):
+        res = self.client.get(media_url(self.blob), HTTP_RANGE="bytes=2-5")
+
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(read(res), CONTENT[2:6])
+        self.assertEqual(res["Content-Range"], f"bytes 2-5/{len(CONTENT)}")
+        self.assertEqual(res["Content-Length"], "4")
+
+    def test_open_and_suffix_ranges(self):
+        res = self.client.get(media_url(self.blob), HTTP_RANGE="bytes=10-")
+        self.assertEqual(read(res), CONTENT[10:])
+
+        res = self.client.get(media_url(self.blob), HTTP_RANGE="bytes=-3")
+        self.assertEqual(read(res), CONTENT[-3:])
+        self.assertEqual(
+            res["Content-Range"],
+            f"bytes {len(CONTENT) - 3}-{len(CONTENT) - 1}/{len(CONTENT)}",
+        )
+
+    def test_unsatisfiable_range(self):
+        res = self.client.get(media_url(self.blob), HTTP_RANGE="bytes=100-")
+
+        self.assertEqual(
+            res.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(res["Content-Range"], f"bytes */{len(CONTENT)}")
+
+    def test_if_range_mismatch_sends_whole_file(self):
+        res = self.client.get(
+            media_url(self.blob),
+            HTTP_RANGE="bytes=0-3",
+            HTTP_IF_RANGE='"other"',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(read(res), CONTENT)
+
+    def test_missing_file_and_traversal_not_found(self):
+        for name in ("docs/missing.txt", "docs", "../manage.py"):
+            res = self.client.get(f"/media/{name}")
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unsafe_method_not_allowed(self):
+        res = self.client.post(media_url(self.blob))
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    @override_settings(MEDIA_SENDFILE_HEADER="X-Accel-Redirect")
+    def test_accel_redirect(self):
+        res = self.client.get(media_url(self.blob))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["X-Accel-Redirect"], f"/protected-media/{self.blob}")
+        self.assertEqual(res.content, b"")
+        self.assertIn("immutable", res["Cache-Control"])
+
+    @override_settings(MEDIA_SENDFILE_HEADER="X-Sendfile")
+    def test_sendfile(self):
+        res = self.client.get(media_url(self.plain))
+
+        self.assertEqual(res["X-Sendfile"], default_storage.path(self.plain))
+        self.assertEqual(res.content, b"")
@@ -0,0 +1,123 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.tests.init_sample import (
+    init_sample_country,
+    init_sample_superuser
+)
+from airport_service.metrics import METRICS, Histogram
+
+COUNTRY_URL = reverse("airport:country-list")
+METRICS_URL = reverse("metrics")
+ROUTE = 'route="airport:country-list",method="GET"'
+
+
+class HistogramTests(SimpleTestCase):
+    def test_samples_cumulative(self):
+        histogram = Histogram("sample", "Sample", (1, 5), labels=("route",))
+        for value in (0, 1, 3, 7):
+            histogram.observe(value, "a")
+
+        self.assertEqual(
+            list(histogram.samples()),
+            [
+                ('sample_bucket{route="a",le="1"}', 2),
+                ('sample_bucket{route="a",le="5"}', 3),
+                ('sample_bucket{route="a",le="+Inf"}', 4),
+                ('sample_sum{route="a"}', 11),
+                ('sample_count{route="a"}', 4),
+            ],
+        )
+
+    def test_label_values_escaped(self):
+        histogram = Histogram("sample", "Sample", (1,), labels=("route",))
+        histogram.observe(0, 'a"\\')
+
+        self.assertIn('route="a\\"\\\\"', next(histogram.samples())[0])
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        for metric in METRICS:
+            metric.clear()
+        user = init_sample_superuser()
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.staff_client = Client()
+        self.staff_client.force_login(user)
+        init_sample_country()
+
+    def scrape(self, client=None, **headers):
+        return (client or self.staff_client).get(METRICS_URL, **headers)
+
+    def test_request_recorded(self):
+        self.client.get(COUNTRY_URL)
+        self.client.get(COUNTRY_URL)
+
+        res = self.scrape()
+        text = res.content.decode()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            f'airport_http_responses_total{{{ROUTE},status="200"}} 2', text
+        )
+        self.assertIn("# TYPE airport_http_request_db_queries histogram", text)
+        # Country version & list, the version row is created first time
+        self.assertIn(
+            f'airport_http_request_db_queries_bucket{{{ROUTE},le="2"}} 1',
+            text,
+        )
+        self.assertIn(
+            f'airport_http_request_db_queries_bucket{{{ROUTE},le="5"}} 2',
+            text,
+        )
+        for name in (
+            "duration_seconds",
+            "db_seconds",
+            "serializer_seconds",
+            "render_seconds",
+        ):
+            self.assertIn(
+                f"airport_http_request_{name}_count{{{ROUTE}}} 2", text
+            )
+        self.assertIn(
+            f"airport_http_response_size_bytes_count{{{ROUTE}}} 2", text
+        )
+
+    def test_unmatched_route(self):
+        self.client.get("/missing/")
+
+        self.assertIn(
+            'route="unmatched",method="GET",status="404"',
+            self.scrape().content.decode(),
+        )
+
+    def test_closed_to_others_without_token(self):
+        user = get_user_model().objects.create_user("other@test.com", "pass")
+        client = Client()
+        client.force_login(user)
+
+        for scraper in (Client(), client):
+            self.assertEqual(
+                self.scrape(scraper).status_code, status.HTTP_403_FORBIDDEN
+            )
+        self.assertEqual(
+            self.scrape(Client(), HTTP_AUTHORIZATION="Bearer ").status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token_required(self):
+        self.assertEqual(
+            self.scrape(Client()).status_code, status.HTTP_403_FORBIDDEN
+        )
+        self.assertEqual(
+            self.scrape(
+                Client(), HTTP_AUTHORIZATION="Bearer secret"
+            ).status_code,
+            status.HTTP_200_OK,
+        )
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class TicketsSoldMigrationTests(TransactionTestCase):
+    migrate_from = [("airport", "0002_flight_seat_map")]
+    migrate_to = [("airport", "0003_flight_tickets_sold")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_flights_without_tickets_count_zero(self):
+        apps = self.migrate(self.migrate_from)
+        airplane_type = apps.get_model("airport", "AirplaneType")
+        airplane = apps.get_model("airport", "Airplane").objects.create(
+            name="Airplane",
+            rows=3,
+            seats_in_row=3,
+            airplane_type=airplane_type.objects.create(name="Type"),
+        )
+        country = apps.get_model("airport", "Country").objects.create(
+            name="Country"
+        )
+        city = apps.get_model("airport", "City").objects.create(
+            name="City", country=country
+        )
+        airport = apps.get_model("airport", "Airport")
+        route = apps.get_model("airport", "Route").objects.create(
+            source=airport.objects.create(name="A", closest_big_city=city),
+            destination=airport.objects.create(name="B", closest_big_city=city),
+            distance=100,
+        )
+        flight = apps.get_model("airport", "Flight").objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=datetime.now(),
+            arrival_time=datetime.now() + timedelta(hours=2),
+        )
+
+        apps = self.migrate(self.migrate_to)
+
+        self.assertEqual(
+            apps.get_model("airport", "Flight")
+            .objects.get(pk=flight.pk).tickets_sold,
+            0,
+        )
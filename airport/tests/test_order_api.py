@@ -1,9 +1,12 @@
+from django.db import connection
+from django.db.models import Prefetch
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from airport.models import Order
+from airport.models import Flight, Order, Ticket
 from airport.serializers import OrderListSerializer, OrderSerializer
 from airport.tests.init_sample import (
     init_sample_user,
@@ -40,13 +43,65 @@ class AuthenticatedOrderApiTests(TestCase):
         init_sample_order(user=self.user)
         res = self.client.get(ORDER_URL)
 
-        orders = Order.objects.order_by("-created_at")
+        orders = Order.objects.order_by("-created_at").prefetch_related(
+            Prefetch(
+                "tickets__flight",
+                queryset=Flight.objects.with_tickets_available()
+            )
+        )
         serializer = OrderListSerializer(orders, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         for key, value in serializer.data[0].items():
             self.assertEqual(res.data["results"][0][key], value)
 
+    def test_list_orders_query_count(self):
+        def list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.get(ORDER_URL)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            return res, len(queries)
+
+        init_sample_order(user=self.user)
+        res, expected = list_queries()
+        self.assertLessEqual(expected, 5)
+        self.assertEqual(
+            res.data["results"][0]["tickets"][0]["flight"]["tickets_available"],
+            98
+        )
+
+        for _ in range(4):
+            init_sample_order(user=self.user)
+        res, num_queries = list_queries()
+        self.assertEqual(len(res.data["results"]), 5)
+        self.assertEqual(num_queries, expected)
+
+    def test_list_orders_normalized(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        init_sample_order(user=self.user)
+
+        res = self.client.get(ORDER_URL, {"format_mode": "normalized"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual(
+            res.data["results"][1]["tickets"],
+            [
+                {"id": ticket.id, "row": ticket.row, "seat": ticket.seat,
+                 "flight": flight.id}
+                for ticket in order.tickets.all()
+            ]
+        )
+        flights = res.data["included"]["flights"]
+        self.assertEqual(len(flights), 2)
+        self.assertIn(flight.id, [included["id"] for included in flights])
+        self.assertEqual(flights[0]["tickets_available"], 98)
+
+    def test_list_orders_invalid_format_mode(self):
+        res = self.client.get(ORDER_URL, {"format_mode": "flat"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_retrieve_order_detail(self):
         init_sample_order(user=self.user)
         order = init_sample_order(user=self.user)
@@ -83,6 +138,151 @@ class AdminOrderApiTests(TestCase):
 
         self.assertEqual(res.data, serializer.data)
 
+    def test_create_group_order_in_bulk(self):
+        flight = init_sample_flight()
+        tickets_data = {
+            "tickets": [
+                {"row": 3, "seat": seat, "flight": flight.id}
+                for seat in range(1, 10)
+            ]
+        }
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(ORDER_URL, tickets_data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertLessEqual(len(queries), 11)
+        flight.refresh_from_db()
+        self.assertEqual(flight.tickets_sold, 9)
+        self.assertEqual(
+            list(flight.seats.taken()), [(3, seat) for seat in range(1, 10)]
+        )
+
+    def test_create_order_taken_seat(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        tickets_data = {
+            "tickets": [
+                {"row": 5, "seat": 5, "flight": flight.id},
+                {"row": 2, "seat": 2, "flight": flight.id},
+            ]
+        }
+        res = self.client.post(ORDER_URL, tickets_data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["taken"], [{"flight": flight.id, "row": 2, "seat": 2}]
+        )
+        self.assertEqual(Ticket.objects.filter(flight=flight).count(), 2)
+
+    def test_create_order_taken_seat_stale_seat_map(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        Flight.objects.filter(id=flight.id).update(seat_map=b"")
+        tickets_data = {
+            "tickets": [{"row": 1, "seat": 1, "flight": flight.id}]
+        }
+        res = self.client.post(ORDER_URL, tickets_data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["taken"], [{"flight": flight.id, "row": 1, "seat": 1}]
+        )
+
+    def test_create_order_same_seat_twice(self):
+        flight = init_sample_flight()
+        tickets_data = {
+            "tickets": [
+                {"row": 5, "seat": 5, "flight": flight.id},
+                {"row": 5, "seat": 5, "flight": flight.id},
+            ]
+        }
+        res = self.client.post(ORDER_URL, tickets_data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"][1]["non_field_errors"],
+            ["The fields flight, row, seat must make a unique set."]
+        )
+        self.assertFalse(Order.objects.exists())
+
+    def test_create_order_seat_out_of_range(self):
+        flight = init_sample_flight()
+        tickets_data = {
+            "tickets": [{"row": 11, "seat": 1, "flight": flight.id}]
+        }
+        res = self.client.post(ORDER_URL, tickets_data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row", res.data["tickets"][0])
+
+    def test_create_order_auto_seats(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        res = self.client.post(
+            ORDER_URL,
+            {"auto_seats": {"flight": flight.id, "count": 3}},
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(ticket["row"], ticket["seat"]) for ticket in res.data["tickets"]],
+            [(1, 2), (1, 3), (1, 4)]
+        )
+        flight.refresh_from_db()
+        self.assertEqual(flight.tickets_sold, 5)
+
+    def test_create_order_auto_seats_adjacent(self):
+        order = init_sample_order(user=self.user)
+        flight = order.tickets.first().flight
+        for count, row in ((9, 1), (10, 3)):
+            res = self.client.post(
+                ORDER_URL,
+                {
+                    "auto_seats": {
+                        "flight": flight.id, "count": count, "adjacent": True
+                    }
+                },
+                format="json"
+            )
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(
+                [
+                    (ticket["row"], ticket["seat"])
+                    for ticket in res.data["tickets"]
+                ],
+                [(row, seat) for seat in range(11 - count, 11)]
+            )
+
+    def test_create_order_auto_seats_unavailable(self):
+        flight = init_sample_flight()
+        auto_seats = {"flight": flight.id, "count": 11, "adjacent": True}
+        res = self.client.post(
+            ORDER_URL, {"auto_seats": auto_seats}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        order = init_sample_order(user=self.user)
+        auto_seats = {"flight": order.tickets.first().flight.id, "count": 99}
+        res = self.client.post(
+            ORDER_URL, {"auto_seats": auto_seats}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_create_order_auto_seats_with_tickets(self):
+        flight = init_sample_flight()
+        res = self.client.post(
+            ORDER_URL,
+            {
+                "tickets": [{"row": 1, "seat": 1, "flight": flight.id}],
+                "auto_seats": {"flight": flight.id, "count": 1},
+            },
+            format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_update_order(self):
         order = init_sample_order(user=self.user)
         res = self.client.put(detail_url(order.id))
@@ -0,0 +1,125 @@
+import gzip
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Country
+from airport.tests.init_sample import (
+    init_sample_user,
+    init_sample_airplane_type,
+    init_sample_route
+)
+
+BUNDLE_URL = reverse("airport:reference-bundle")
+
+
+class UnauthenticatedReferenceBundleTests(TestCase):
+    def test_auth_required(self):
+        res = APIClient().get(BUNDLE_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ReferenceBundleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = init_sample_user()
+        self.client.force_authenticate(self.user)
+        self.route = init_sample_route()
+        init_sample_airplane_type()
+
+    def test_bundle_content(self):
+        res = self.client.get(BUNDLE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/json")
+        data = json.loads(res.content)
+        self.assertEqual(data["version"], res["X-Reference-Version"])
+        self.assertEqual(
+            set(data),
+            {
+                "version", "countries", "cities", "airports",
+                "airplane_types", "routes"
+            }
+        )
+        self.assertEqual(
+            data["routes"][0],
+            {
+                "id": self.route.id,
+                "source": self.route.source.name,
+                "destination": self.route.destination.name,
+                "distance": self.route.distance,
+            }
+        )
+        self.assertEqual(len(data["airports"]), 2)
+
+    def test_bundle_gzipped(self):
+        plain = self.client.get(BUNDLE_URL)
+        res = self.client.get(BUNDLE_URL, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res["Vary"])
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+
+    def test_gzip_refused_with_zero_quality(self):
+        for accept_encoding in ("gzip;q=0, br", "br, *;q=0", "identity"):
+            res = self.client.get(
+                BUNDLE_URL, HTTP_ACCEPT_ENCODING=accept_encoding
+            )
+            self.assertNotIn("Content-Encoding", res)
+        res = self.client.get(BUNDLE_URL, HTTP_ACCEPT_ENCODING="br, *;q=0.5")
+        self.assertEqual(res["Content-Encoding"], "gzip")
+
+    def test_etag_per_content_coding(self):
+        plain = self.client.get(BUNDLE_URL)
+        gzipped = self.client.get(BUNDLE_URL, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertNotEqual(plain["ETag"], gzipped["ETag"])
+        res = self.client.get(
+            BUNDLE_URL,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=plain["ETag"],
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(
+            BUNDLE_URL,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=gzipped["ETag"],
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bundle_served_from_cache(self):
+        first = self.client.get(BUNDLE_URL)
+        # Only the versions of bundled models
+        with self.assertNumQueries(1):
+            res = self.client.get(BUNDLE_URL)
+
+        self.assertEqual(res.content, first.content)
+        self.assertEqual(res["X-Reference-Version"], first["X-Reference-Version"])
+
+    def test_bundle_rebuilt_after_change(self):
+        first = self.client.get(BUNDLE_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            Country.objects.create(name="New country")
+
+        res = self.client.get(BUNDLE_URL)
+
+        self.assertNotEqual(
+            res["X-Reference-Version"], first["X-Reference-Version"]
+        )
+        self.assertIn(
+            "New country",
+            [country["name"] for country in json.loads(res.content)["countries"]]
+        )
+
+    def test_bundle_not_modified(self):
+        etag = self.client.get(BUNDLE_URL)["ETag"]
+
+        res = self.client.get(BUNDLE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
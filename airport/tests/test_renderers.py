@@ -0,0 +1,89 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import msgpack
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from airport.models import Country
+from airport.tests.init_sample import (
+    init_sample_superuser,
+    init_sample_flight
+)
+from airport_service.renderers import FastJSONRenderer
+
+COUNTRY_URL = reverse("airport:country-list")
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class FastJSONRendererTests(TestCase):
+    def test_same_output_as_json_renderer(self):
+        data = {
+            "name": "Zürich\u2028",
+            "price": Decimal("1.50"),
+            "when": datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc),
+            "items": [1, None, True, 0.5],
+        }
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_fallback_for_big_integers(self):
+        data = {"big": 2 ** 70}
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_indented_output(self):
+        content = FastJSONRenderer().render(
+            {"a": 1}, "application/json; indent=2"
+        )
+        self.assertEqual(content, b'{\n  "a": 1\n}')
+
+
+class MessagePackApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = init_sample_superuser()
+        self.client.force_authenticate(self.user)
+
+    def test_json_by_default(self):
+        init_sample_flight()
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(len(json.loads(res.content)["results"]), 1)
+
+    def test_msgpack_response(self):
+        init_sample_flight()
+        json_res = self.client.get(FLIGHT_URL)
+
+        res = self.client.get(FLIGHT_URL, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(res.content), json_res.json())
+        self.assertLess(len(res.content), len(json_res.content))
+
+    def test_msgpack_request(self):
+        res = self.client.post(
+            COUNTRY_URL,
+            msgpack.packb({"name": "Packed country"}),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            msgpack.unpackb(res.content)["name"], "Packed country"
+        )
+        self.assertTrue(Country.objects.filter(name="Packed country").exists())
+
+    def test_msgpack_request_invalid(self):
+        res = self.client.post(
+            COUNTRY_URL, b"\xc1", content_type="application/msgpack"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,155 @@
+import json
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Country, Crew
+from airport.tests.init_sample import (
+    init_sample_flight,
+    init_sample_superuser
+)
+from airport_service.cache import shared_cache
+from airport_service.db.routers import (
+    ReplicaRouter,
+    pin_key,
+    read_replica,
+    wrote,
+)
+
+COUNTRY_URL = reverse("airport:country-list")
+CREW_URL = reverse("airport:crew-list")
+FLIGHT_URL = reverse("airport:flight-list")
+BUNDLE_URL = reverse("airport:reference-bundle")
+REPLICA = "replica_test"
+REPLICA_PATH = os.path.join(
+    tempfile.gettempdir(), f"airport_replica_{os.getpid()}.sqlite3"
+)
+
+# Registered on import, before the test runner sets up databases: it
+# creates & migrates the replica file and removes it afterwards
+connections.settings[REPLICA] = connections.configure_settings(
+    {
+        "default": connections.settings["default"],
+        REPLICA: {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": REPLICA_PATH,
+            "TEST": {"NAME": REPLICA_PATH},
+        }
+    }
+)[REPLICA]
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTests(TestCase):
+    # The replica is a second SQLite file, migrated but never written by
+    # the tests, so rows seen in responses tell which database was read
+    databases = {"default", REPLICA}
+
+    def setUp(self):
+        cache.clear()
+        shared_cache.clear()
+        self.client = APIClient()
+        self.user = init_sample_superuser()
+        self.client.force_authenticate(self.user)
+        Country.objects.create(name="Primary country")
+        Crew.objects.create(first_name="Primary", last_name="Crew")
+
+    def tearDown(self):
+        cache.clear()
+        shared_cache.clear()
+
+    def test_safe_request_reads_replica(self):
+        res = self.client.get(CREW_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [])
+
+    def test_replica_responses_keyed_by_replica_versions(self):
+        init_sample_flight()
+        replica = [
+            self.client.get(url)
+            for url in (COUNTRY_URL, FLIGHT_URL, BUNDLE_URL)
+        ]
+
+        with override_settings(DATABASE_REPLICAS=[]):
+            countries = self.client.get(
+                COUNTRY_URL, HTTP_IF_NONE_MATCH=replica[0]["ETag"]
+            )
+            flights = self.client.get(FLIGHT_URL)
+            bundle = self.client.get(BUNDLE_URL)
+
+        # Empty replica data is never served for the primary versions
+        self.assertEqual(replica[0].data, [])
+        self.assertEqual(replica[1].data["results"], [])
+        self.assertEqual(countries.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(countries.data), Country.objects.count())
+        self.assertEqual(flights["X-Cache"], "MISS")
+        self.assertEqual(len(flights.data["results"]), 1)
+        self.assertNotEqual(
+            bundle["X-Reference-Version"], replica[2]["X-Reference-Version"]
+        )
+        self.assertEqual(
+            len(json.loads(bundle.content)["countries"]),
+            Country.objects.count(),
+        )
+
+    def test_reads_after_write_pinned_to_primary(self):
+        res = self.client.post(
+            CREW_URL, {"first_name": "New", "last_name": "Added"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.get(CREW_URL)
+
+        self.assertEqual(
+            [crew["first_name"] for crew in res.data], ["New", "Primary"]
+        )
+        self.assertTrue(shared_cache.get(pin_key(self.user.pk)))
+
+    def test_pin_expires(self):
+        self.client.post(CREW_URL, {"first_name": "New", "last_name": "Added"})
+        shared_cache.delete(pin_key(self.user.pk))
+
+        res = self.client.get(CREW_URL)
+
+        self.assertEqual(res.data, [])
+
+    def test_router_context(self):
+        router = ReplicaRouter()
+        wrote_token = wrote.set(False)
+        try:
+            self.assertEqual(router.db_for_read(Country), "default")
+
+            token = read_replica.set(REPLICA)
+            self.assertEqual(router.db_for_read(Country), REPLICA)
+            router.db_for_write(Country)
+            self.assertEqual(router.db_for_read(Country), "default")
+            read_replica.reset(token)
+        finally:
+            wrote.reset(wrote_token)
+
+    def test_database_cache_on_primary(self):
+        router = ReplicaRouter()
+        cache_entry = DatabaseCache("cache_table", {}).cache_model_class
+        wrote_token = wrote.set(False)
+        token = read_replica.set(REPLICA)
+        try:
+            self.assertEqual(router.db_for_read(cache_entry), "default")
+            self.assertEqual(router.db_for_write(cache_entry), "default")
+            self.assertFalse(wrote.get())
+        finally:
+            read_replica.reset(token)
+            wrote.reset(wrote_token)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        res = self.client.get(CREW_URL)
+
+        self.assertEqual(len(res.data), 1)
@@ -0,0 +1,166 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Flight, Order, SeatHold
+from airport.tests.init_sample import (
+    init_sample_user,
+    init_sample_superuser,
+    init_sample_flight,
+)
+
+FLIGHT_HOLDS = "airport:flight-holds"
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+
+
+def holds_url(instance_id):
+    return reverse(FLIGHT_HOLDS, args=[instance_id])
+
+
+class AuthenticatedSeatHoldApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = init_sample_user()
+        self.client.force_authenticate(self.user)
+
+    def test_create_hold_forbidden(self):
+        flight = init_sample_flight()
+        res = self.client.post(
+            holds_url(flight.id),
+            {"seats": [{"row": 1, "seat": 1}]},
+            format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AdminSeatHoldApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = init_sample_superuser()
+        self.client.force_authenticate(self.user)
+        self.flight = init_sample_flight()
+
+    def _hold(self, *seats):
+        return self.client.post(
+            holds_url(self.flight.id),
+            {"seats": [{"row": row, "seat": seat} for row, seat in seats]},
+            format="json"
+        )
+
+    def _expire_holds(self):
+        SeatHold.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+    def test_create_hold(self):
+        res = self._hold((1, 1), (1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["flight"], self.flight.id)
+        self.assertGreater(res.data["expires_at"], timezone.now().isoformat())
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_held, 2)
+        self.assertEqual(list(self.flight.held_seats.taken()), [(1, 1), (1, 2)])
+
+        res = self.client.get(FLIGHT_URL)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 98)
+
+    def test_create_hold_invalid_seats(self):
+        self.assertEqual(
+            self._hold((11, 1)).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self._hold((1, 1), (1, 1)).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_hold_conflicts(self):
+        self._hold((1, 1))
+
+        res = self._hold((1, 2), (1, 1))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["taken"], [{"flight": self.flight.id, "row": 1, "seat": 1}]
+        )
+
+    def test_expired_hold_seats_can_be_held(self):
+        self._hold((1, 1))
+        self._expire_holds()
+
+        res = self._hold((1, 1))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.count(), 1)
+
+    def test_order_from_hold(self):
+        hold_id = self._hold((1, 1), (1, 2)).data["id"]
+
+        res = self.client.post(ORDER_URL, {"hold": hold_id}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(ticket["row"], ticket["seat"]) for ticket in res.data["tickets"]],
+            [(1, 1), (1, 2)]
+        )
+        self.assertFalse(SeatHold.objects.exists())
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_held, 0)
+        self.assertEqual(self.flight.tickets_sold, 2)
+
+    def test_order_from_expired_hold(self):
+        hold_id = self._hold((1, 1)).data["id"]
+        self._expire_holds()
+
+        res = self.client.post(ORDER_URL, {"hold": hold_id}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_order_from_hold_of_other_user(self):
+        hold = SeatHold.objects.create(
+            flight=self.flight,
+            user=get_user_model().objects.create_user("other@test.com", "pass"),
+            seats=[{"row": 1, "seat": 1}],
+            expires_at=timezone.now() + timedelta(minutes=5),
+        )
+        res = self.client.post(ORDER_URL, {"hold": hold.id}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_order_held_seat(self):
+        self._hold((1, 1))
+        tickets_data = {
+            "tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]
+        }
+
+        res = self.client.post(ORDER_URL, tickets_data, format="json")
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+        self._expire_holds()
+        res = self.client.post(ORDER_URL, tickets_data, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_held, 0)
+
+    def test_release_expired_holds_command(self):
+        self._hold((1, 1))
+        self._hold((2, 2))
+        SeatHold.objects.filter(seats=[{"row": 1, "seat": 1}]).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        out = StringIO()
+        call_command("release_expired_holds", stdout=out)
+
+        self.assertIn("Released 1", out.getvalue())
+        self.flight.refresh_from_db()
+        self.assertEqual(list(self.flight.held_seats.taken()), [(2, 2)])
+        self.assertEqual(self.flight.seats_held, 1)
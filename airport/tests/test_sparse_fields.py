@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.tests.init_sample import (
+    init_sample_user,
+    init_sample_city,
+    init_sample_flight
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+CITY_URL = reverse("airport:city-list")
+
+
+@override_settings(FLIGHT_LIST_CACHE_TTL=0)
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = init_sample_user()
+        self.client.force_authenticate(self.user)
+        self.flight = init_sample_flight()
+
+    def get_with_queries(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, [query["sql"] for query in queries]
+
+    def test_flight_list_fields(self):
+        res, queries = self.get_with_queries(
+            FLIGHT_URL, {"fields": "id,departure_time,tickets_available"}
+        )
+
+        self.assertEqual(
+            list(res.data["results"][0]),
+            ["id", "departure_time", "tickets_available"]
+        )
+        self.assertEqual(res.data["results"][0]["tickets_available"], 100)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("airport_route", queries[0])
+
+    def test_flight_list_omit(self):
+        res, queries = self.get_with_queries(
+            FLIGHT_URL, {"omit": "crew,tickets_available"}
+        )
+
+        flight = res.data["results"][0]
+        self.assertNotIn("crew", flight)
+        self.assertNotIn("tickets_available", flight)
+        self.assertIn("route_source", flight)
+        self.assertEqual(len(queries), 1)
+
+    def test_flight_list_all_fields(self):
+        res, queries = self.get_with_queries(FLIGHT_URL, {})
+
+        self.assertIn("crew", res.data["results"][0])
+        self.assertEqual(len(queries), 2)
+
+    def test_flight_retrieve_fields(self):
+        url = reverse("airport:flight-detail", args=[self.flight.id])
+        res, queries = self.get_with_queries(url, {"fields": "id,crew"})
+
+        self.assertEqual(list(res.data), ["id", "crew"])
+        self.assertEqual(len(res.data["crew"]), 2)
+        self.assertEqual(len(queries), 2)
+
+    def test_unknown_fields(self):
+        res = self.client.get(FLIGHT_URL, {"fields": "id,price"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("price", res.data["fields"])
+
+    def test_city_list_without_country_join(self):
+        init_sample_city()
+        res, queries = self.get_with_queries(CITY_URL, {"omit": "country"})
+
+        self.assertEqual(list(res.data[0]), ["id", "name"])
+        self.assertNotIn("airport_country", queries[-1])
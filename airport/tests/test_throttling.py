@@ -0,0 +1,126 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from airport.tests.init_sample import init_sample_superuser
+from airport_service.cache import shared_cache
+from airport_service.throttling import SlidingWindowThrottleMixin
+
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+
+
+class Clock:
+    def __init__(self, now=600.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class KeyThrottle(SlidingWindowThrottleMixin, SimpleRateThrottle):
+    rate = "4/min"
+
+    def get_cache_key(self, request, view):
+        return "throttle_test_key"
+
+
+class SlidingWindowThrottleTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = shared_cache
+        self.cache.clear()
+        self.clock = Clock()
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def request(self):
+        throttle = KeyThrottle()
+        throttle.timer = self.clock
+        return throttle, throttle.allow_request(None, None)
+
+    def test_limit_within_window(self):
+        results = [self.request()[1] for _ in range(5)]
+
+        self.assertEqual(results, [True, True, True, True, False])
+
+    def test_state_is_two_counters(self):
+        for _ in range(3):
+            self.request()
+        self.clock.now += 90
+        for _ in range(2):
+            self.request()
+
+        self.assertEqual(
+            self.cache.get_many(
+                ["throttle_test_key:10", "throttle_test_key:11"]
+            ),
+            {"throttle_test_key:10": 3, "throttle_test_key:11": 2},
+        )
+
+    def test_previous_window_weighted(self):
+        for _ in range(4):
+            self.request()
+        # 4 * 0.75 requests of previous window still count
+        self.clock.now += 75
+        self.assertTrue(self.request()[1])
+        self.assertFalse(self.request()[1])
+
+        # 4 * 0.5 + 1
+        self.clock.now += 15
+        self.assertTrue(self.request()[1])
+
+    def test_wait(self):
+        for _ in range(4):
+            self.request()
+        throttle, allowed = self.request()
+
+        self.assertFalse(allowed)
+        # Counted requests fall under the limit after 1/4 of next window
+        self.assertAlmostEqual(throttle.wait(), 75)
+
+        self.clock.now += throttle.wait()
+        self.assertTrue(self.request()[1])
+
+
+class ActionScopedThrottleTests(TestCase):
+    def setUp(self):
+        shared_cache.clear()
+        self.client = APIClient()
+        self.user = init_sample_superuser()
+        self.client.force_authenticate(self.user)
+
+    def tearDown(self):
+        shared_cache.clear()
+
+    def test_flight_search_scope(self):
+        with mock.patch.dict(
+            api_settings.DEFAULT_THROTTLE_RATES, {"flight_search": "2/min"}
+        ):
+            statuses = [
+                self.client.get(FLIGHT_URL).status_code for _ in range(3)
+            ]
+            res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(statuses[:2], [status.HTTP_200_OK] * 2)
+        self.assertEqual(statuses[2], status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+
+    def test_order_create_scope_leaves_list(self):
+        with mock.patch.dict(
+            api_settings.DEFAULT_THROTTLE_RATES, {"order_create": "1/hour"}
+        ):
+            first = self.client.post(ORDER_URL, {}, format="json")
+            second = self.client.post(ORDER_URL, {}, format="json")
+            listed = self.client.get(ORDER_URL)
+
+        self.assertEqual(first.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            second.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Airplane
+from airport.tests.init_sample import (
+    init_sample_user,
+    init_sample_city,
+    init_sample_flight,
+    init_sample_order
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+ROUTE_URL = reverse("airport:route-list")
+CITY_URL = reverse("airport:city-list")
+
+
+@override_settings(FLIGHT_LIST_CACHE_TTL=0)
+class ValuesListSerializersTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = init_sample_user()
+        self.client.force_authenticate(self.user)
+        init_sample_order(user=self.user)
+        init_sample_flight()
+        init_sample_city(name="Other city")
+        Airplane.objects.update(airplane_photo="uploads/airplanes/sample.jpg")
+
+    def assert_same_response(self, url, params=None):
+        with override_settings(VALUES_LIST_SERIALIZERS=False):
+            expected = self.client.get(url, params).json()
+        cache.clear()
+        with override_settings(VALUES_LIST_SERIALIZERS=True):
+            res = self.client.get(url, params).json()
+        self.assertEqual(res, expected)
+        return res
+
+    def test_flight_list(self):
+        res = self.assert_same_response(FLIGHT_URL)
+
+        flight = res["results"][-1]
+        self.assertEqual(flight["crew"], ["First1 Last1", "First2 Last2"])
+        self.assertEqual(flight["tickets_available"], 98)
+        self.assertTrue(
+            flight["airplane_image"].endswith("uploads/airplanes/sample.jpg")
+        )
+
+    def test_flight_list_filtered_page(self):
+        self.assert_same_response(
+            FLIGHT_URL, {"source": "sample", "page_size": 1}
+        )
+
+    def test_route_list(self):
+        self.assert_same_response(ROUTE_URL)
+        self.assert_same_response(ROUTE_URL, {"destination": "airport 2"})
+
+    def test_city_list(self):
+        self.assert_same_response(CITY_URL)
+
+    @override_settings(VALUES_LIST_SERIALIZERS=True)
+    def test_flight_list_queries(self):
+        for _ in range(3):
+            init_sample_flight()
+
+        with self.assertNumQueries(2):
+            self.client.get(FLIGHT_URL)
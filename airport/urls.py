@@ -10,6 +10,8 @@ from airport.views import (
     AirplaneTypeViewSet,
     AirplaneViewSet,
     FlightViewSet,
+    ItineraryViewSet,
+    ReferenceBundleView,
     OrderViewSet,
 )
 
@@ -22,9 +24,17 @@ router.register("crews", CrewViewSet)
 router.register("airplane-types", AirplaneTypeViewSet)
 router.register("airplanes", AirplaneViewSet)
 router.register("flights", FlightViewSet)
+router.register("itineraries", ItineraryViewSet, basename="itinerary")
 router.register("orders", OrderViewSet)
 
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path(
+        "reference-bundle/",
+        ReferenceBundleView.as_view(),
+        name="reference-bundle"
+    ),
+    path("", include(router.urls)),
+]
 
 app_name = "airport"
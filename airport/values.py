@@ -0,0 +1,149 @@
+import abc
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from airport.images import variant_urls
+from airport.models import Flight
+
+_datetime_field = serializers.DateTimeField()
+
+
+class ValuesSerializer(abc.ABC):
+    """Read-only list serializer working on .values() rows.
+
+    Renders the same JSON as the model serializer it mirrors, but from
+    one projection query: no model instances are built and no attribute
+    paths are walked per field. Subclasses list the lookups they need in
+    values_fields and build output dicts in to_representation.
+    """
+
+    values_fields = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+
+    def project(self, queryset):
+        return queryset.select_related(None).prefetch_related(None).values(
+            *self.values_fields
+        )
+
+    def prepare(self, rows) -> None:
+        """Hook to fetch related data of all rows at once"""
+
+    @abc.abstractmethod
+    def to_representation(self, row) -> dict:
+        """Output dict of one projected row"""
+
+    def render(self, rows) -> list[dict]:
+        rows = list(rows)
+        self.prepare(rows)
+        return [self.to_representation(row) for row in rows]
+
+    def file_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class CityListValuesSerializer(ValuesSerializer):
+    values_fields = ("id", "name", "country__name")
+
+    def to_representation(self, row) -> dict:
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "country": row["country__name"],
+        }
+
+
+class RouteListValuesSerializer(ValuesSerializer):
+    values_fields = ("id", "source__name", "destination__name", "distance")
+
+    def to_representation(self, row) -> dict:
+        return {
+            "id": row["id"],
+            "source": row["source__name"],
+            "destination": row["destination__name"],
+            "distance": row["distance"],
+        }
+
+
+class FlightListValuesSerializer(ValuesSerializer):
+    values_fields = (
+        "id",
+        "departure_time",
+        "arrival_time",
+        "route__source__name",
+        "route__destination__name",
+        "airplane__name",
+        "airplane__rows",
+        "airplane__seats_in_row",
+        "airplane__airplane_photo",
+        "tickets_available",
+    )
+
+    def prepare(self, rows) -> None:
+        self.crew = {row["id"]: [] for row in rows}
+        crew_names = (
+            Flight.crew.through.objects
+            .filter(flight_id__in=self.crew)
+            .order_by("crew__last_name")
+            .values_list("flight_id", "crew__first_name", "crew__last_name")
+        )
+        for flight_id, first_name, last_name in crew_names:
+            self.crew[flight_id].append(f"{first_name} {last_name}")
+
+    def to_representation(self, row) -> dict:
+        return {
+            "id": row["id"],
+            "departure_time": _datetime_field.to_representation(
+                row["departure_time"]
+            ),
+            "arrival_time": _datetime_field.to_representation(
+                row["arrival_time"]
+            ),
+            "route_source": row["route__source__name"],
+            "route_destination": row["route__destination__name"],
+            "airplane_name": row["airplane__name"],
+            "airplane_capacity": (
+                row["airplane__rows"] * row["airplane__seats_in_row"]
+            ),
+            "tickets_available": row["tickets_available"],
+            "airplane_image": self.file_url(row["airplane__airplane_photo"]),
+            "airplane_image_variants": variant_urls(
+                row["airplane__airplane_photo"], self.context.get("request")
+            ),
+            "crew": self.crew[row["id"]],
+        }
+
+
+class ValuesListMixin:
+    # List action renders values_serializer_class rows instead of
+    # get_serializer_class() objects when VALUES_LIST_SERIALIZERS is on.
+    # The response shape (and OpenAPI schema) stays the serializer's.
+    # Sparse fieldsets (SparseFieldsMixin) use the model serializers.
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if (
+            not settings.VALUES_LIST_SERIALIZERS
+            or getattr(self, "get_sparse_fields", lambda: None)() is not None
+        ):
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.values_serializer_class(
+            context=self.get_serializer_context()
+        )
+        queryset = serializer.project(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.render(page))
+        return Response(serializer.render(queryset))
@@ -1,15 +1,26 @@
-from django.db.models import F, Count, Q
+from django.conf import settings
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
 from django_filters import rest_framework as filters
 from django_filters.filters import DateFromToRangeFilter
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from airport.bundle import accepts_gzip, get_reference_bundle
+from airport.cache import get_flight_list, set_flight_list
+from airport.conditional import ConditionalGetMixin
+from airport.images import schedule_variants
+from airport.itineraries import find_itineraries
 from airport.models import (
     Country,
     City,
@@ -22,6 +33,16 @@ from airport.models import (
     Order
 )
 from airport.permissions import IsAdminOrIfAuthenticatedReadOnly
+from airport.replicas import ReplicaReadMixin
+from airport.search import search_airports
+from airport.seatmap import SeatMap
+from airport.sparse import SparseFieldsMixin
+from airport.values import (
+    CityListValuesSerializer,
+    FlightListValuesSerializer,
+    RouteListValuesSerializer,
+    ValuesListMixin,
+)
 from airport.serializers import (
     CountrySerializer,
     CitySerializer,
@@ -39,51 +60,84 @@ from airport.serializers import (
     FlightListSerializer,
     FlightSerializer,
     FlightDetailSerializer,
+    FlightSeatMapSerializer,
+    ItinerarySearchSerializer,
+    ItinerarySerializer,
+    ReferenceBundleSerializer,
     RouteDetailSerializer,
+    SeatHoldSerializer,
     OrderSerializer,
-    OrderListSerializer
+    OrderListSerializer,
+    OrderNormalizedSerializer
 )
 
 
-class CountryViewSet(viewsets.ModelViewSet):
+class CountryViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet
+):
+    version_models = ("country",)
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
 
-class CityViewSet(viewsets.ModelViewSet):
+class CityViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet
+):
+    version_models = ("city", "country")
+    values_serializer_class = CityListValuesSerializer
+    sparse_fields_relations = {"country": {"select_related": ("country",)}}
     queryset = City.objects.all()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
-    def get_queryset(self):
-        qs = super().get_queryset()
-        if self.action == "list":
-            return qs.select_related("country")
-        return qs
-
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
             return CityListSerializer
         return CitySerializer
 
 
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet
+):
+    version_models = ("airport", "city")
+    sparse_fields_relations = {
+        "closest_big_city": {"select_related": ("closest_big_city",)}
+    }
     queryset = Airport.objects.all()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
-    def get_queryset(self):
-        qs = super().get_queryset()
-        if self.action == "list":
-            return qs.select_related("closest_big_city")
-        return qs
-
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
             return AirportListSerializer
         return AirportSerializer
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet
+):
+    version_models = ("route", "airport", "city")
+    values_serializer_class = RouteListValuesSerializer
+    # Detail serializer renders closest big cities of the airports
+    sparse_fields_relations = {
+        "source": {"select_related": ("source__closest_big_city",)},
+        "destination": {
+            "select_related": ("destination__closest_big_city",)
+        },
+    }
     queryset = Route.objects.all()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
@@ -94,21 +148,11 @@ class RouteViewSet(viewsets.ModelViewSet):
             src_str = self.request.query_params.get("source")
             dest_str = self.request.query_params.get("destination")
             if src_str:
-                queryset = queryset.filter(
-                    Q(source__name__icontains=src_str)
-                    | Q(source__closest_big_city__name__icontains=src_str)
-                )
+                queryset = queryset.filter(source__in=search_airports(src_str))
             if dest_str:
                 queryset = queryset.filter(
-                    Q(destination__name__icontains=dest_str)
-                    | Q(
-                        destination__closest_big_city__name__icontains=dest_str
-                    )
+                    destination__in=search_airports(dest_str)
                 )
-            return queryset.select_related(
-                "source__closest_big_city",
-                "destination__closest_big_city"
-            )
 
         return queryset
 
@@ -140,7 +184,9 @@ class RouteViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class CrewViewSet(viewsets.ModelViewSet):
+class CrewViewSet(
+    ReplicaReadMixin, SparseFieldsMixin, viewsets.ModelViewSet
+):
     queryset = Crew.objects.all()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
@@ -162,17 +208,30 @@ class CrewViewSet(viewsets.ModelViewSet):
 
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        if "photo" in request.FILES:
+            schedule_variants(crew.photo.name)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet
+):
+    version_models = ("airplanetype",)
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
 
-class AirplaneViewSet(viewsets.ModelViewSet):
-    queryset = Airplane.objects.all().select_related("airplane_type")
+class AirplaneViewSet(
+    ReplicaReadMixin, SparseFieldsMixin, viewsets.ModelViewSet
+):
+    sparse_fields_relations = {
+        "airplane_type": {"select_related": ("airplane_type",)}
+    }
+    queryset = Airplane.objects.all()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
     def get_serializer_class(self):
@@ -195,18 +254,14 @@ class AirplaneViewSet(viewsets.ModelViewSet):
 
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        if "airplane_photo" in request.FILES:
+            schedule_variants(airplane.airplane_photo.name)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class FlightFilter(filters.FilterSet):
-    source = filters.CharFilter(
-        field_name="route__source__name",
-        lookup_expr="icontains"
-    )
-    destination = filters.CharFilter(
-        field_name="route__destination__name",
-        lookup_expr="icontains"
-    )
+    source = filters.CharFilter(method="filter_airport")
+    destination = filters.CharFilter(method="filter_airport")
     departure_date = DateFromToRangeFilter(field_name="departure_time")
     arrival_date = DateFromToRangeFilter(field_name="arrival_time")
 
@@ -219,27 +274,73 @@ class FlightFilter(filters.FilterSet):
             "arrival_date"
         ]
 
+    def filter_airport(self, queryset, name, value):
+        return queryset.filter(
+            **{f"route__{name}__in": search_airports(value, with_city=False)}
+        )
+
+
+class FlightPagination(CursorPagination):
+    """Cursor pagination, newest flights first.
+
+    The cursor keeps the departure_time of the page edge; flights sharing
+    it are skipped by an offset. id only makes the order deterministic.
+    """
+
+    ordering = ("-departure_time", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = settings.FLIGHT_MAX_PAGE_SIZE
+
 
 class FlightViewSet(
+    ReplicaReadMixin,
+    ValuesListMixin,
+    SparseFieldsMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet
 ):
-    queryset = (
-        Flight.objects.all()
-        .select_related("route", "airplane")
-        .annotate(
-            tickets_available=(
-                F("airplane__rows") * F("airplane__seats_in_row")
-                - Count("tickets")
+    values_serializer_class = FlightListValuesSerializer
+    sparse_fields_relations = {
+        "route_source": {"select_related": ("route__source",)},
+        "route_destination": {"select_related": ("route__destination",)},
+        "airplane_name": {"select_related": ("airplane",)},
+        "airplane_capacity": {"select_related": ("airplane",)},
+        "airplane_image": {"select_related": ("airplane",)},
+        "airplane_image_variants": {"select_related": ("airplane",)},
+        "tickets_available": {"annotations": ("with_tickets_available",)},
+        "crew": {"prefetch_related": ("crew",)},
+        "route": {
+            "select_related": (
+                "route__source__closest_big_city",
+                "route__destination__closest_big_city",
             )
-        ).prefetch_related("crew")
-    )
+        },
+        "airplane": {"select_related": ("airplane__airplane_type",)},
+        "taken_places": {"select_related": ("airplane",)},
+    }
+    queryset = Flight.objects.all()
     serializer_class = FlightSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = FlightFilter
+    pagination_class = FlightPagination
+    throttle_scopes = {"list": "flight_search"}
+
+    def get_queryset(self):
+        if self.action == "seatmap":
+            return Flight.objects.select_related("airplane").only(
+                "id",
+                "seat_map",
+                "held_map",
+                "airplane__rows",
+                "airplane__seats_in_row"
+            )
+        if self.action == "holds":
+            return Flight.objects.select_related("airplane")
+        return super().get_queryset()
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -248,8 +349,55 @@ class FlightViewSet(
         if self.action == "retrieve":
             return FlightDetailSerializer
 
+        if self.action == "seatmap":
+            return FlightSeatMapSerializer
+
+        if self.action == "holds":
+            return SeatHoldSerializer
+
         return FlightSerializer
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "encoding",
+                type=OpenApiTypes.STR,
+                enum=SeatMap.ENCODINGS,
+                description="Seat map encoding (ex. ?encoding=rle). "
+                            "base64: packed bitmap, row by row, "
+                            "most significant bit first; "
+                            "rle: lengths of alternating free/taken runs, "
+                            "starting with free",
+            ),
+        ]
+    )
+    @action(methods=["GET"], detail=True, url_path="seatmap")
+    def seatmap(self, request, pk=None):
+        """Endpoint for compact seat occupancy of specific flight"""
+        encoding = request.query_params.get("encoding", "base64")
+        if encoding not in SeatMap.ENCODINGS:
+            raise ValidationError(
+                {"encoding": f"Must be one of: {', '.join(SeatMap.ENCODINGS)}"}
+            )
+        flight = self.get_object()
+        serializer = self.get_serializer(
+            flight,
+            context={**self.get_serializer_context(), "encoding": encoding}
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(methods=["POST"], detail=True, url_path="holds")
+    def holds(self, request, pk=None):
+        """Endpoint for holding seats of specific flight for a while"""
+        flight = self.get_object()
+        serializer = self.get_serializer(
+            data=request.data,
+            context={**self.get_serializer_context(), "flight": flight}
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save(flight=flight, user=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -296,7 +444,58 @@ class FlightViewSet(
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        """Flights list, cached until any of listed data changes"""
+        key, data = get_flight_list(request)
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = super().list(request, *args, **kwargs)
+        set_flight_list(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class ItineraryViewSet(ReplicaReadMixin, GenericViewSet):
+    serializer_class = ItinerarySerializer
+    permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scopes = {"list": "flight_search"}
+
+    @extend_schema(parameters=[ItinerarySearchSerializer])
+    def list(self, request, *args, **kwargs):
+        """Direct & connecting flights between airports or cities on date"""
+        search = ItinerarySearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        itineraries = find_itineraries(**search.validated_data)
+        serializer = self.get_serializer(itineraries, many=True)
+        return Response(serializer.data)
+
+
+class ReferenceBundleView(ReplicaReadMixin, GenericAPIView):
+    serializer_class = ReferenceBundleSerializer
+    permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+
+    def get(self, request, *args, **kwargs):
+        """Countries, cities, airports, airplane types & routes at once.
+
+        Served as prerendered (gzipped if accepted) JSON from cache,
+        X-Reference-Version tells the version of the bundle.
+        """
+        version, bundle = get_reference_bundle()
+        gzipped = accepts_gzip(request.headers.get("Accept-Encoding", ""))
+        # Strong validators differ per content coding
+        etag = quote_etag(f"{version}-gzip" if gzipped else version)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                bundle["gzip"] if gzipped else bundle["json"],
+                content_type="application/json"
+            )
+            if gzipped:
+                response["Content-Encoding"] = "gzip"
+        response["ETag"] = etag
+        response["X-Reference-Version"] = version
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
 
 
 class OrderPagination(PageNumberPagination):
@@ -305,28 +504,90 @@ class OrderPagination(PageNumberPagination):
 
 
 class OrderViewSet(
+    ReplicaReadMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet,
 ):
-    queryset = Order.objects.prefetch_related(
-        "tickets__flight__route",
-        "tickets__flight__airplane",
-        "tickets__flight__crew",
-    )
+    FORMAT_MODES = ("nested", "normalized")
+
+    queryset = Order.objects.prefetch_related("tickets")
     serializer_class = OrderSerializer
     pagination_class = OrderPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scopes = {"create": "order_create"}
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        queryset = super().get_queryset().filter(user=self.request.user)
+        if self.action == "list":
+            # Every flight is fetched once, whatever number of its tickets
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "tickets__flight",
+                    queryset=(
+                        Flight.objects
+                        .select_related(
+                            "route__source", "route__destination", "airplane"
+                        )
+                        .with_tickets_available()
+                        .prefetch_related("crew")
+                    )
+                )
+            )
+        return queryset
+
+    def get_format_mode(self):
+        format_mode = self.request.query_params.get("format_mode", "nested")
+        if format_mode not in self.FORMAT_MODES:
+            modes = ", ".join(self.FORMAT_MODES)
+            raise ValidationError({"format_mode": f"Must be one of: {modes}"})
+        return format_mode
 
     def get_serializer_class(self):
         if self.action == "list":
+            if self.get_format_mode() == "normalized":
+                return OrderNormalizedSerializer
             return OrderListSerializer
 
         return OrderSerializer
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "format_mode",
+                type=OpenApiTypes.STR,
+                enum=FORMAT_MODES,
+                description="Response layout (ex. ?format_mode=normalized). "
+                            "nested: every ticket embeds its flight; "
+                            "normalized: tickets refer to flights by id, "
+                            "flights are listed once in included.flights",
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        if self.get_format_mode() != "normalized":
+            return super().list(request, *args, **kwargs)
+
+        page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        flights = {
+            ticket.flight_id: ticket.flight
+            for order in page
+            for ticket in order.tickets.all()
+        }
+        response = self.get_paginated_response(
+            self.get_serializer(page, many=True).data
+        )
+        response.data["included"] = {
+            "flights": FlightListSerializer(
+                flights.values(),
+                many=True,
+                context=self.get_serializer_context()
+            ).data
+        }
+        return response
@@ -0,0 +1,8 @@
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+# Entries every worker must see the same: throttle counters & read-your-
+# writes pins. Redis in deployments with several workers (see settings).
+SHARED_CACHE_ALIAS = "shared"
+
+shared_cache = ConnectionProxy(caches, SHARED_CACHE_ALIAS)
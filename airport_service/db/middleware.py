@@ -0,0 +1,22 @@
+from airport_service.db.routers import pin_to_primary, wrote
+
+
+class ReadYourWritesMiddleware:
+    """Pin the user of a request that wrote to the primary database.
+
+    The user's next requests read from the primary for
+    REPLICA_PIN_SECONDS, so replicas lagging behind never hide a write.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if wrote.get():
+                pin_to_primary(getattr(request, "user", None))
+        finally:
+            wrote.reset(token)
+        return response
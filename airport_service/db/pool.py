@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """DB-API connections shared by the threads of a process.
+
+    At most `size` connections are open or handed out; get() waits up to
+    `timeout` seconds for one to be returned. Idle connections are reused
+    last in, first out, so rarely used ones are the first the server
+    times out. With a `check` callable, connections idle for at least
+    `check_after` seconds are checked before reuse: the server or a
+    proxy may have dropped them without closed being set. Connections
+    failing the check (raising) are replaced. Waits and checks are
+    counted in metrics().
+    """
+
+    timer = time.monotonic
+
+    def __init__(
+        self,
+        connect,
+        size: int,
+        timeout: float,
+        check=None,
+        check_after: float = 0.0,
+    ):
+        self.connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.check = check
+        self.check_after = check_after
+        self._idle = deque()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._counts = {
+            "connects": 0,
+            "reuses": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "checks": 0,
+            "broken": 0,
+        }
+        self._wait_seconds = 0.0
+        self._wait_seconds_max = 0.0
+
+    def get(self):
+        if not self._slots.acquire(blocking=False):
+            started = time.perf_counter()
+            acquired = self._slots.acquire(timeout=self.timeout)
+            self._record_wait(time.perf_counter() - started, acquired)
+            if not acquired:
+                raise PoolTimeout(
+                    f"No connection returned to the pool of {self.size} "
+                    f"within {self.timeout} seconds"
+                )
+        try:
+            connection = self._take_idle()
+            if connection is None:
+                connection = self.connect()
+                self._count("connects")
+            else:
+                self._count("reuses")
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_use += 1
+        return connection
+
+    def put(self, connection, discard: bool = False) -> None:
+        """Return connection, closing it when discarded or broken"""
+        try:
+            if discard or connection.closed:
+                self._close(connection)
+            else:
+                with self._lock:
+                    self._idle.append((connection, self.timer()))
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection, _ in idle:
+            self._close(connection)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                **self._counts,
+                "wait_seconds": self._wait_seconds,
+                "wait_seconds_max": self._wait_seconds_max,
+            }
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, returned_at = self._idle.pop()
+            if not connection.closed and self._alive(connection, returned_at):
+                return connection
+            self._close(connection)
+
+    def _alive(self, connection, returned_at: float) -> bool:
+        if self.check is None or (
+            self.timer() - returned_at < self.check_after
+        ):
+            return True
+        self._count("checks")
+        try:
+            self.check(connection)
+        except Exception:
+            self._count("broken")
+            return False
+        return True
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def _record_wait(self, seconds: float, acquired: bool) -> None:
+        with self._lock:
+            self._counts["waits"] += 1
+            if not acquired:
+                self._counts["timeouts"] += 1
+            self._wait_seconds += seconds
+            self._wait_seconds_max = max(self._wait_seconds_max, seconds)
+
+    @staticmethod
+    def _close(connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    key, connect, size: int, timeout: float, check=None, check_after=0.0
+) -> ConnectionPool:
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                connect, size, timeout, check, check_after
+            )
+        return _pools[key]
+
+
+def pool_metrics() -> dict:
+    """Metrics of every pool of the process by database alias"""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {alias: pool.metrics() for (alias, _), pool in pools}
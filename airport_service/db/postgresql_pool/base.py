@@ -0,0 +1,82 @@
+import psycopg2
+import psycopg2.extensions
+import psycopg2.extras
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from airport_service.db.pool import PoolTimeout, get_pool
+
+DEFAULT_POOL = {"SIZE": 10, "TIMEOUT": 5.0, "CHECK_AFTER": 30.0}
+
+
+def check_connection(connection) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    # Leave no transaction open without autocommit
+    connection.rollback()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL (psycopg2) backend taking connections from a pool.
+
+    Closing a connection returns it to the process wide pool configured
+    by the POOL setting of the database ({"SIZE": ..., "TIMEOUT": ...}),
+    so keep CONN_MAX_AGE at 0: every request gets a pooled connection
+    and gives it back once finished. With CONN_HEALTH_CHECKS, connections
+    idle for POOL["CHECK_AFTER"] seconds run SELECT 1 before reuse.
+    """
+
+    def get_pool(self, conn_params):
+        options = {**DEFAULT_POOL, **self.settings_dict.get("POOL", {})}
+        return get_pool(
+            (self.alias, repr(sorted(conn_params.items()))),
+            lambda: self.Database.connect(**conn_params),
+            int(options["SIZE"]),
+            float(options["TIMEOUT"]),
+            check=(
+                check_connection
+                if self.settings_dict["CONN_HEALTH_CHECKS"]
+                else None
+            ),
+            check_after=float(options["CHECK_AFTER"]),
+        )
+
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = IsolationLevel(
+                options.get("isolation_level", IsolationLevel.READ_COMMITTED)
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level "
+                f"{options['isolation_level']} specified. "
+                f"Use one of the psycopg.IsolationLevel values."
+            )
+
+        self.connection_pool = self.get_pool(conn_params)
+        try:
+            connection = self.connection_pool.get()
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc)) from exc
+        # Pooled connections keep the level of their previous user
+        connection.isolation_level = self.isolation_level
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        discard = self.errors_occurred or self.connection.closed
+        if not discard and (
+            self.connection.get_transaction_status()
+            != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        ):
+            try:
+                self.connection.rollback()
+            except self.Database.Error:
+                discard = True
+        self.connection_pool.put(self.connection, discard=discard)
@@ -0,0 +1,75 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from airport_service.cache import shared_cache
+
+# Replica serving the reads of the current request, if any
+read_replica = ContextVar("read_replica", default=None)
+# The current request wrote to the primary
+wrote = ContextVar("wrote", default=False)
+# Entries of DatabaseCache, if configured, are read where written
+CACHE_APP_LABEL = "django_cache"
+
+
+def choose_replica():
+    """Replica for all reads of a request, so they see one state"""
+    if settings.DATABASE_REPLICAS:
+        return random.choice(settings.DATABASE_REPLICAS)
+    return None
+
+
+def pin_key(user_id) -> str:
+    return f"replica_pin:{user_id}"
+
+
+def pin_to_primary(user) -> None:
+    """Keep reads of user on the primary for REPLICA_PIN_SECONDS"""
+    if user is not None and user.is_authenticated:
+        shared_cache.set(
+            pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS
+        )
+
+
+def is_pinned(user) -> bool:
+    return bool(
+        user is not None
+        and user.is_authenticated
+        and shared_cache.get(pin_key(user.pk))
+    )
+
+
+class ReplicaRouter:
+    """Send reads to DATABASE_REPLICAS when the request allows it.
+
+    Only requests that set read_replica (ReplicaReadMixin views) read,
+    all from the replica chosen for them; once a request writes, its
+    later reads stay on the primary, as do reads of users pinned after a
+    recent write.
+    Database cache entries always stay on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        replica = read_replica.get()
+        if replica and not wrote.get():
+            return replica
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,137 @@
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+# Cache-Control of media whose name does not depend on its content
+MUTABLE_CACHE_CONTROL = "public, no-cache"
+
+
+def _is_blob(name: str) -> bool:
+    return getattr(default_storage, "is_blob", lambda name: False)(name)
+
+
+def _validators(name: str, file_stat) -> tuple[str, str]:
+    """ETag & Cache-Control of stored file"""
+    if _is_blob(name):
+        # The name is the content hash
+        return (
+            quote_etag(name.rsplit("/", 1)[-1]),
+            default_storage.cache_control,
+        )
+    return (
+        quote_etag(f"{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}"),
+        MUTABLE_CACHE_CONTROL,
+    )
+
+
+def _byte_range(request, etag: str, size: int):
+    """(start, end) of requested single byte range, None for whole file.
+
+    Raises ValueError for unsatisfiable ranges.
+    """
+    match = RANGE_HEADER.match(request.headers.get("Range", "").strip())
+    if not match or request.headers.get("If-Range", etag) != etag:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError("Unsatisfiable range")
+    return start, end
+
+
+def _read_range(media_file, start: int, length: int):
+    with media_file:
+        media_file.seek(start)
+        while length > 0:
+            chunk = media_file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _file_response(request, full_path: str, etag: str, file_stat):
+    content_type = (
+        mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    )
+    if settings.MEDIA_SENDFILE_HEADER == "X-Accel-Redirect":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = (
+            settings.MEDIA_ACCEL_REDIRECT_LOCATION
+            + os.path.relpath(full_path, default_storage.location)
+        )
+        return response
+    if settings.MEDIA_SENDFILE_HEADER:
+        response = HttpResponse(content_type=content_type)
+        response[settings.MEDIA_SENDFILE_HEADER] = full_path
+        return response
+
+    try:
+        byte_range = _byte_range(request, etag, file_stat.st_size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{file_stat.st_size}"
+        return response
+    if byte_range is None:
+        return FileResponse(open(full_path, "rb"), content_type=content_type)
+
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        _read_range(open(full_path, "rb"), start, end - start + 1),
+        status=206,
+        content_type=content_type,
+    )
+    response["Content-Length"] = end - start + 1
+    response["Content-Range"] = f"bytes {start}-{end}/{file_stat.st_size}"
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Serve a file of the default storage with validators & byte ranges.
+
+    Content-hash (blob) names are cacheable for a year, other files must
+    be revalidated. With MEDIA_SENDFILE_HEADER set the body is left to
+    the front proxy (nginx X-Accel-Redirect, Apache X-Sendfile).
+    """
+    try:
+        full_path = default_storage.path(path)
+        file_stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404("File does not exist")
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404("File does not exist")
+
+    etag, cache_control = _validators(path, file_stat)
+    last_modified = int(file_stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    ) or _file_response(request, full_path, etag, file_stat)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = cache_control
+    response["Accept-Ranges"] = "bytes"
+    return response
@@ -0,0 +1,290 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_safe
+
+from airport_service.db.pool import pool_metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LABELS = ("route", "method")
+SECONDS_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+def _labels(names, values, **extra) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(
+        f'{name}="{_escape(value)}"' for name, value in pairs
+    ) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Prometheus histogram: counts per bucket & sum by label values"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets, labels=LABELS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [
+                    [0] * (len(self.buckets) + 1), 0
+                ]
+            series[0][index] += 1
+            series[1] += value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def samples(self):
+        with self._lock:
+            series = [
+                (values, list(counts), total)
+                for values, (counts, total) in self._series.items()
+            ]
+        for values, counts, total in sorted(series):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(float(bound))
+                yield (
+                    f"{self.name}_bucket"
+                    f"{_labels(self.labels, values, le=le)}",
+                    cumulative,
+                )
+            yield f"{self.name}_sum{_labels(self.labels, values)}", total
+            yield (
+                f"{self.name}_count{_labels(self.labels, values)}",
+                cumulative,
+            )
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + 1
+
+    def value(self, *label_values) -> int:
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            yield f"{self.name}{_labels(self.labels, label_values)}", value
+
+
+RESPONSES = Counter(
+    "airport_http_responses_total",
+    "Responses by route, method & status code",
+    labels=(*LABELS, "status"),
+)
+REQUEST_SECONDS = Histogram(
+    "airport_http_request_duration_seconds",
+    "Time from the first middleware to the response",
+    SECONDS_BUCKETS,
+)
+QUERIES = Histogram(
+    "airport_http_request_db_queries",
+    "SQL queries run by a request",
+    QUERY_BUCKETS,
+)
+DB_SECONDS = Histogram(
+    "airport_http_request_db_seconds",
+    "Time spent in SQL queries of a request",
+    SECONDS_BUCKETS,
+)
+SERIALIZER_SECONDS = Histogram(
+    "airport_http_request_serializer_seconds",
+    "Time of the view outside SQL queries (mostly serialization)",
+    SECONDS_BUCKETS,
+)
+RENDER_SECONDS = Histogram(
+    "airport_http_request_render_seconds",
+    "Time rendering the response data (JSON, MessagePack, ...)",
+    SECONDS_BUCKETS,
+)
+RESPONSE_BYTES = Histogram(
+    "airport_http_response_size_bytes",
+    "Size of response bodies, streamed responses excluded",
+    SIZE_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "airport_cache_lookups_total",
+    "Lookups of cached responses by cache & result (hit, miss)",
+    labels=("cache", "result"),
+)
+METRICS = (
+    RESPONSES,
+    REQUEST_SECONDS,
+    QUERIES,
+    DB_SECONDS,
+    SERIALIZER_SECONDS,
+    RENDER_SECONDS,
+    RESPONSE_BYTES,
+    CACHE_LOOKUPS,
+)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.view_started = None
+        self.view_db_seconds = 0.0
+        self.serializer_seconds = None
+        self.render_started = None
+
+    def execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.queries += 1
+
+
+class MetricsMiddleware:
+    """Record query count, DB, serializer & render time and size by route.
+
+    Observations only update in-process histograms; they are formatted
+    when /metrics is scraped. Every worker process keeps its own.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = request.metrics_timings = RequestTimings()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(timings.execute)
+                )
+            response = self.get_response(request)
+        finished = time.perf_counter()
+
+        match = request.resolver_match
+        labels = (match.view_name if match else "unmatched", request.method)
+        RESPONSES.inc(*labels, response.status_code)
+        REQUEST_SECONDS.observe(finished - started, *labels)
+        QUERIES.observe(timings.queries, *labels)
+        DB_SECONDS.observe(timings.db_seconds, *labels)
+        if timings.serializer_seconds is not None:
+            SERIALIZER_SECONDS.observe(timings.serializer_seconds, *labels)
+        if timings.render_started is not None:
+            RENDER_SECONDS.observe(finished - timings.render_started, *labels)
+        if not response.streaming:
+            RESPONSE_BYTES.observe(len(response.content), *labels)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = request.metrics_timings
+        timings.view_started = time.perf_counter()
+        timings.view_db_seconds = timings.db_seconds
+
+    def process_template_response(self, request, response):
+        # Called once the view returned, before the response is rendered
+        timings = request.metrics_timings
+        timings.render_started = time.perf_counter()
+        if timings.view_started is not None:
+            timings.serializer_seconds = max(
+                timings.render_started
+                - timings.view_started
+                - (timings.db_seconds - timings.view_db_seconds),
+                0,
+            )
+        return response
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(
+            f"{name} {_number(value)}" for name, value in metric.samples()
+        )
+
+    pools = pool_metrics()
+    if pools:
+        names = next(iter(pools.values()))
+        for name in names:
+            metric = f"airport_db_pool_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.extend(
+                f"{metric}{_labels(('database',), (alias,))} "
+                f"{_number(values[name])}"
+                for alias, values in pools.items()
+            )
+    return "\n".join(lines) + "\n"
+
+
+@require_safe
+def metrics_view(request):
+    """Metrics in Prometheus text format.
+
+    Readable by staff (admin session) and by scrapers sending
+    METRICS_TOKEN as a bearer token; closed to others, even without a
+    token configured.
+    """
+    user = getattr(request, "user", None)
+    is_staff = user is not None and user.is_staff
+    has_token = bool(settings.METRICS_TOKEN) and constant_time_compare(
+        request.headers.get("Authorization", ""),
+        f"Bearer {settings.METRICS_TOKEN}",
+    )
+    if not (is_staff or has_token):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
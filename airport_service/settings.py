@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/5.0/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
+import importlib.util
 import os
 from datetime import timedelta
 from pathlib import Path
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "airport_service.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -59,6 +61,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "airport_service.db.middleware.ReadYourWritesMiddleware",
 ]
 
 ROOT_URLCONF = "airport_service.urls"
@@ -99,9 +102,93 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
         "HOST": os.environ.get("POSTGRES_HOST"),
         "PORT": os.environ.get("POSTGRES_PORT"),
+        # Seconds to keep a connection across requests (0: per request)
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", 0)),
+        # Check persistent (or long idle pooled) connections before reuse
+        "CONN_HEALTH_CHECKS": (
+            os.environ.get("POSTGRES_CONN_HEALTH_CHECKS", "")
+            in ("1", "true", "True")
+        ),
+        # In-process pool of POSTGRES_ENGINE=
+        # airport_service.db.postgresql_pool (keep CONN_MAX_AGE at 0)
+        "POOL": {
+            "SIZE": int(os.environ.get("POSTGRES_POOL_SIZE", 10)),
+            "TIMEOUT": float(os.environ.get("POSTGRES_POOL_TIMEOUT", 5)),
+            # Idle seconds after which CONN_HEALTH_CHECKS run SELECT 1
+            "CHECK_AFTER": float(
+                os.environ.get("POSTGRES_POOL_CHECK_AFTER", 30)
+            ),
+        },
     }
 }
 
+# Read replicas of the default database, comma separated hosts, or files
+# with the sqlite3 engine (ex. DATABASE_REPLICAS=db.replica.sqlite3)
+DATABASE_REPLICAS = []
+for number, location in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICAS", "").split(",")), 1
+):
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        (
+            "NAME" if DATABASES["default"]["ENGINE"].endswith("sqlite3")
+            else "HOST"
+        ): location.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{number}")
+
+DATABASE_ROUTERS = ["airport_service.db.routers.ReplicaRouter"]
+
+# Seconds reads of a user stay on the primary database after a write
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+
+CACHES = {
+    # Process-local by default: responses are cached under model versions
+    # kept in the database, so a worker never serves a stale entry
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    },
+    # Throttle counters & read-your-writes pins, one store for every
+    # worker: with several processes or hosts set SHARED_CACHE_BACKEND=
+    # django.core.cache.backends.redis.RedisCache & SHARED_CACHE_LOCATION=
+    # redis://<host>:6379/0
+    "shared": {
+        "BACKEND": os.environ.get(
+            "SHARED_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("SHARED_CACHE_LOCATION", "shared"),
+    },
+}
+
+# Seconds to keep the token user (is_active, is_staff, ...) cached,
+# 0 reads it from the database on every request
+USER_AUTH_CACHE_TTL = int(os.environ.get("USER_AUTH_CACHE_TTL", 60))
+
+# Seconds to keep cached flight list responses, 0 disables caching
+FLIGHT_LIST_CACHE_TTL = int(os.environ.get("FLIGHT_LIST_CACHE_TTL", 60))
+
+# Seconds seats stay reserved by a seat hold
+SEAT_HOLD_TTL = int(os.environ.get("SEAT_HOLD_TTL", 600))
+
+# Render hot list endpoints from .values() rows instead of model objects
+VALUES_LIST_SERIALIZERS = (
+    os.environ.get("VALUES_LIST_SERIALIZERS", "") in ("1", "true", "True")
+)
+
+# Processes resizing uploaded photos, 0 resizes in the request
+IMAGE_VARIANT_WORKERS = int(os.environ.get("IMAGE_VARIANT_WORKERS", 2))
+
+# Seconds to keep a version of the reference data bundle
+REFERENCE_BUNDLE_CACHE_TTL = int(
+    os.environ.get("REFERENCE_BUNDLE_CACHE_TTL", 86400)
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -144,6 +231,27 @@ MEDIA_URL = "/media/"
 # MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_ROOT = "/media" if os.environ.get("POSTGRES_DB") else BASE_DIR / "media"
 
+# Uploads are stored once by content hash, see collect_media_garbage
+STORAGES = {
+    "default": {
+        "BACKEND": "airport_service.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Behind a front proxy the media view only sets this header and leaves
+# sending the file to the proxy: "X-Accel-Redirect" (nginx, to an internal
+# location at MEDIA_ACCEL_REDIRECT_LOCATION) or "X-Sendfile" (Apache)
+MEDIA_SENDFILE_HEADER = os.environ.get("MEDIA_SENDFILE_HEADER", "")
+MEDIA_ACCEL_REDIRECT_LOCATION = os.environ.get(
+    "MEDIA_ACCEL_REDIRECT_LOCATION", "/protected-media/"
+)
+
+# Bearer token of /metrics scrapers, empty for staff (admin session) only
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -151,16 +259,44 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "airport_service.throttling.AnonSlidingWindowThrottle",
+        "airport_service.throttling.UserSlidingWindowThrottle",
+        "airport_service.throttling.ActionScopedThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "300/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "100/day",
+        "user": "300/day",
+        "flight_search": "120/min",
+        "order_create": "60/hour",
+    },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "airport_service.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# MessagePack requests & responses (Content-Type / Accept:
+# application/msgpack) when msgpack is installed
+if importlib.util.find_spec("msgpack"):
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "airport_service.renderers.MessagePackRenderer"
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].append(
+        "airport_service.renderers.MessagePackParser"
+    )
+
+# Ceiling for ?page_size= of the cursor paginated flight list
+FLIGHT_MAX_PAGE_SIZE = int(os.environ.get("FLIGHT_MAX_PAGE_SIZE", 100))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Airport API Service",
     "DESCRIPTION": "System for tracking flights from airports across the world.",
@@ -0,0 +1,73 @@
+import hashlib
+import pathlib
+import re
+
+from django.core.files.storage import FileSystemStorage
+
+BLOB_DIR = "blobs"
+BLOB_NAME = re.compile(rf"^{BLOB_DIR}/[0-9a-f]{{2}}/[0-9a-f]{{64}}[.\w]*$")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage keeping every file once, named by its content.
+
+    Uploads are stored as blobs/<hh>/<sha256><suffix> whatever name they
+    were given, so identical uploads share one file and a URL never
+    changes its content: responses can be cached as immutable. Names
+    already in the blob form (ex. resized variants of a blob) are kept.
+
+    Blobs may be shared, so delete() keeps them: unreferenced blobs are
+    removed by the collect_media_garbage command.
+    """
+
+    cache_control = "public, max-age=31536000, immutable"
+
+    @staticmethod
+    def is_blob(name: str) -> bool:
+        return bool(BLOB_NAME.match(str(name).replace("\\", "/")))
+
+    @staticmethod
+    def content_name(name: str, content) -> str:
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        suffix = pathlib.PurePath(name).suffix.lower()
+        return f"{BLOB_DIR}/{digest[:2]}/{digest}{suffix}"
+
+    def get_available_name(self, name, max_length=None):
+        # Blob names stand for their content: an existing blob is reused
+        # by _save() instead of being stored again under a random suffix
+        if self.is_blob(name):
+            return name
+        return super().get_available_name(name, max_length=max_length)
+
+    def _save(self, name, content):
+        if not self.is_blob(name):
+            name = self.content_name(name, content)
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+    def save_derived(self, name, content) -> str:
+        """Store a file derived from a stored one (ex. resized variant).
+
+        Derived names of blobs are blobs and stored as such. Files kept
+        before this storage (legacy upload/... names) get their derived
+        files next to them under the given name, where URLs built from
+        the original name point.
+        """
+        if self.is_blob(name):
+            return self.save(name, content)
+        self.delete(name)
+        return super()._save(name, content)
+
+    def delete(self, name):
+        if not self.is_blob(name):
+            super().delete(name)
+
+    def purge(self, name) -> None:
+        """Delete file even if it is a blob"""
+        super().delete(name)
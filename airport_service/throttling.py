@@ -0,0 +1,91 @@
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    UserRateThrottle,
+)
+
+from airport_service.cache import shared_cache
+
+
+class SlidingWindowThrottleMixin:
+    """Sliding window counter for SimpleRateThrottle subclasses.
+
+    Instead of a list of request timestamps per key, two counters are
+    kept: requests of the current and of the previous fixed window. The
+    previous window is weighted by the part of it still inside the
+    sliding window. Counters go through add() & incr() of the shared
+    cache, atomic on Redis, so every worker sees one count.
+    """
+
+    cache = shared_cache
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now / self.duration - window
+        current_key = f"{self.key}:{window}"
+        previous_key = f"{self.key}:{window - 1}"
+        counts = self.cache.get_many([current_key, previous_key])
+        self.current = counts.get(current_key, 0)
+        self.previous = counts.get(previous_key, 0)
+
+        if self.estimate() >= self.num_requests:
+            return self.throttle_failure()
+
+        # Counter lives through the next window, where it is the previous
+        self.cache.add(current_key, 0, timeout=2 * self.duration)
+        try:
+            self.current = self.cache.incr(current_key)
+        except ValueError:
+            self.current = 1
+            self.cache.set(current_key, 1, timeout=2 * self.duration)
+        return True
+
+    def estimate(self) -> float:
+        """Requests within the sliding window ending now"""
+        return self.previous * (1 - self.elapsed) + self.current
+
+    def wait(self):
+        # Next request is allowed once the estimate drops to limit - 1
+        allowed = self.num_requests - 1
+        if self.current <= allowed:
+            # Previous window must fade out enough
+            fade = 1 - (allowed - self.current) / self.previous
+            return max(fade - self.elapsed, 0) * self.duration
+        # Current window becomes the previous one and must fade out
+        fade = 1 - allowed / self.current if self.current else 0
+        return (1 - self.elapsed + max(fade, 0)) * self.duration
+
+
+class AnonSlidingWindowThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    pass
+
+
+class ActionScopedThrottle(SlidingWindowThrottleMixin, ScopedRateThrottle):
+    """Rate of expensive viewset actions, per user & scope.
+
+    Views name the scope of their actions in throttle_scopes, ex.
+    {"list": "flight_search"}; the rate of the scope is taken from
+    DEFAULT_THROTTLE_RATES. Other actions are not throttled.
+    """
+
+    def allow_request(self, request, view):
+        scopes = getattr(view, "throttle_scopes", {})
+        self.scope = scopes.get(getattr(view, "action", None))
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+# User fields permission checks read, loaded from the cache
+CACHED_USER_FIELDS = ("id", "email", "is_active", "is_staff", "is_superuser")
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth_user:{user_id}"
+
+
+def forget_user(user_id) -> None:
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication resolving the token user from the cache.
+
+    The fields of CACHED_USER_FIELDS are kept for USER_AUTH_CACHE_TTL
+    seconds and dropped when the user is saved or deleted; the user is
+    built from them with its other fields deferred, so permission checks
+    run no query. With token revocation on password change (needs the
+    password hash) or a 0 TTL the user is read from the database.
+    """
+
+    def get_user(self, validated_token):
+        if (
+            not settings.USER_AUTH_CACHE_TTL
+            or api_settings.CHECK_REVOKE_TOKEN
+            or api_settings.USER_ID_FIELD != "id"
+        ):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        key = user_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            values = (
+                self.user_model.objects
+                .filter(id=user_id)
+                .values(*CACHED_USER_FIELDS)
+                .first()
+            )
+            if values is None:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                )
+            cache.set(key, values, settings.USER_AUTH_CACHE_TTL)
+
+        # from_db() takes loaded values in the order of model fields
+        field_names = [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.attname in values
+        ]
+        user = self.user_model.from_db(
+            self.user_model.objects.db,
+            field_names,
+            [values[name] for name in field_names],
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        return user
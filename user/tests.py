@@ -1,3 +1,85 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from user.authentication import CachedJWTAuthentication
+
+COUNTRY_URL = reverse("airport:country-list")
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.authentication = CachedJWTAuthentication()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_user_cached(self):
+        with self.assertNumQueries(1):
+            self.authentication.get_user(self.token)
+        with self.assertNumQueries(0):
+            user = self.authentication.get_user(self.token)
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.email, self.user.email)
+        self.assertTrue(user.is_authenticated)
+        self.assertFalse(user.is_staff)
+
+    def test_deferred_fields_loaded_on_access(self):
+        self.authentication.get_user(self.token)
+        user = self.authentication.get_user(self.token)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password("testpass"))
+
+    def test_user_save_invalidates(self):
+        self.authentication.get_user(self.token)
+        self.user.is_staff = True
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            user = self.authentication.get_user(self.token)
+        self.assertTrue(user.is_staff)
+
+    def test_inactive_user_rejected(self):
+        self.authentication.get_user(self.token)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+
+    def test_deleted_user_rejected(self):
+        self.authentication.get_user(self.token)
+        self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+
+    @override_settings(USER_AUTH_CACHE_TTL=0)
+    def test_cache_disabled(self):
+        self.authentication.get_user(self.token)
+
+        with self.assertNumQueries(1):
+            self.authentication.get_user(self.token)
+
+    def test_request_without_user_query(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        client.get(COUNTRY_URL)
+
+        # Only the country version & list itself
+        with self.assertNumQueries(2):
+            res = client.get(COUNTRY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)